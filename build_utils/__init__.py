@@ -0,0 +1,38 @@
+from .deps import (
+    git_reader,
+    read_file,
+    scene_assets,
+    scene_dependencies,
+    scene_fingerprint,
+)
+from .manifest import (
+    BUILD_DIR,
+    MANIFEST_PATH,
+    STITCH_MANIFEST_PATH,
+    BuildManifest,
+    StitchManifest,
+    asset_digest,
+    file_digest,
+    scene_digest,
+    read_json,
+    write_json,
+)
+from .audio_mix import compose_scene_audio, cue_sheet_path, mix_cues
+from .journal import BuildJournal
+from .narration import voiceover_texts
+from .media import (
+    chapter_metadata,
+    conform_command,
+    describe_signature,
+    hls_command,
+    image_variants_command,
+    ladder_command,
+    master_playlist,
+    probe,
+    reference_signature,
+    segment_times,
+    stream_signature,
+)
+from .telemetry import REPORT_DIR, BuildReport, scene_media_stats
+from .tex_exprs import numeric_label_calls, tex_calls
+from .farm import FARM_DIR, JobQueue
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import wave
+
+from .manifest import read_json
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+
+def cue_sheet_path(chapter, scene):
+    """Where a scene rendered with PRECOMPOSE_AUDIO=1 records its sound cues."""
+    return os.path.join(chapter, "media", "audio", f"{scene}.cues.json")
+
+
+def decode_clip(path):
+    """Decode an audio file to float32 samples of shape (frames, CHANNELS)."""
+    import numpy as np
+
+    pcm = subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-i", str(path),
+         "-f", "s16le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"],
+        capture_output=True, check=True,
+    ).stdout
+    return np.frombuffer(pcm, dtype=np.int16).reshape(-1, CHANNELS).astype(np.float32) / 32768
+
+
+def mix_cues(cues):
+    """
+    Mix sound cues into one track.
+
+    Each distinct clip is decoded once, then added into a preallocated
+    buffer at its sample offset, so the cost is one pass over the audio
+    rather than one re-encode of the whole track per cue.
+
+    Args:
+        cues: List of {"path", "time" (seconds), "gain" (dB)} dicts
+
+    Returns:
+        int16 array of shape (frames, CHANNELS)
+    """
+    # Imported here so build_utils does not need NumPy unless audio is precomposed
+    import numpy as np
+
+    clips = {path: decode_clip(path) for path in {cue["path"] for cue in cues}}
+    starts = [round(cue["time"] * SAMPLE_RATE) for cue in cues]
+    length = max((start + len(clips[cue["path"]]) for start, cue in zip(starts, cues)), default=0)
+
+    track = np.zeros((length, CHANNELS), dtype=np.float32)
+    for start, cue in zip(starts, cues):
+        clip = clips[cue["path"]]
+        gain = 10 ** (cue.get("gain", 0) / 20)
+        track[start:start + len(clip)] += clip * gain
+    return (np.clip(track, -1, 1) * 32767).astype(np.int16)
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(CHANNELS)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+
+
+def mux_command(video, audio, output):
+    """ffmpeg argv attaching an audio track to a silent video, copying the video."""
+    return [
+        "ffmpeg", "-y", "-loglevel", "error", "-i", str(video), "-i", str(audio),
+        "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", "aac", "-b:a", "320k", str(output),
+    ]
+
+
+def compose_scene_audio(chapter, scene, video):
+    """
+    Give a scene's silent video its soundtrack, mixed from its cue sheet.
+
+    Returns:
+        Number of cues mixed, or None if the scene has no cue sheet
+    """
+    sheet = cue_sheet_path(chapter, scene)
+    if not os.path.exists(sheet):
+        return None
+    cues = read_json(sheet, {"cues": []})["cues"]
+    if not cues:
+        return 0
+
+    audio = os.path.splitext(sheet)[0] + ".wav"
+    muxed = os.path.splitext(video)[0] + "_mux.mp4"
+    write_wav(audio, mix_cues(cues))
+    subprocess.run(mux_command(video, audio, muxed), check=True)
+    os.replace(muxed, video)
+    os.unlink(audio)
+    return len(cues)
@@ -0,0 +1,275 @@
+import ast
+import hashlib
+import os
+import subprocess
+
+SCENE_UTILS_DIR = "scene_utils"
+# scene_utils imports build_utils at render time (e.g. in setup_scene)
+BUILD_UTILS_DIR = "build_utils"
+
+# Pseudo-symbol for a module's top-level statements that define no name
+MODULE_BODY = "<module>"
+
+
+def read_file(path):
+    """Read a source file from the working tree, or None if it is missing."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def git_reader(rev):
+    """
+    Return a reader that loads source files as they were at a git revision.
+
+    Args:
+        rev: Any git revision (e.g. "HEAD~3", "main", a commit hash)
+
+    Returns:
+        Callable taking a repo-relative path and returning its source or None
+    """
+    def read(path):
+        result = subprocess.run(
+            ["git", "show", f"{rev}:{path.replace(os.sep, '/')}"],
+            capture_output=True, text=True,
+        )
+        return result.stdout if result.returncode == 0 else None
+    return read
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _path_literals(node):
+    """
+    Strings in `node` that could name a file or directory.
+
+    An f-string such as ``f"../scraped_images/{name}.jpg"`` yields the
+    directory its constant prefix names.
+    """
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.JoinedStr):
+            prefix = ""
+            for part in sub.values:
+                if not (isinstance(part, ast.Constant) and isinstance(part.value, str)):
+                    break
+                prefix += part.value
+            if "/" in prefix:
+                yield prefix.rsplit("/", 1)[0]
+        elif isinstance(sub, ast.Constant) and isinstance(sub.value, str):
+            if sub.value.strip() and "\n" not in sub.value and len(sub.value) < 256:
+                yield sub.value
+
+
+def _assigned_names(node):
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    names = []
+    for target in targets:
+        for sub in ast.walk(target):
+            if isinstance(sub, ast.Name):
+                names.append(sub.id)
+    return names
+
+
+class ModuleIndex:
+    """
+    Top-level symbols of one module and the names each of them references.
+
+    Symbols are hashed from their AST, so comment and whitespace edits do not
+    invalidate anything. Imports that resolve to scene_utils, build_utils or
+    a sibling SceneN module are kept so references can be followed across
+    files, including imports made inside functions (which then count as
+    names the function references).
+    """
+
+    def __init__(self, path, source, package_dir=SCENE_UTILS_DIR):
+        self.path = path
+        self.exists = source is not None
+        self.nodes = {}
+        self.imports = {}
+        self.star_imports = []
+        body = []
+
+        tree = ast.parse(source or "", filename=path)
+        in_package = os.path.dirname(os.path.normpath(path)) in (
+            os.path.normpath(package_dir), os.path.normpath(BUILD_UTILS_DIR),
+        )
+
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.nodes.setdefault(node.name, []).append(node)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                for name in _assigned_names(node):
+                    self.nodes.setdefault(name, []).append(node)
+            elif not isinstance(node, (ast.Import, ast.ImportFrom)):
+                body.append(node)
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                self._add_import(node, in_package, package_dir)
+
+        self.tree = tree
+        self.body = body
+        self.body_digest = _digest("".join(ast.dump(node) for node in body))
+        self.refs = {
+            name: {
+                sub.id for node in nodes for sub in ast.walk(node)
+                if isinstance(sub, ast.Name) and sub.id != name
+            } & (self.nodes.keys() | self.imports.keys())
+            for name, nodes in self.nodes.items()
+        }
+        # Names used by top-level statements, e.g. a setup call in __init__.py
+        self.body_refs = {
+            sub.id for node in body for sub in ast.walk(node) if isinstance(sub, ast.Name)
+        } & (self.nodes.keys() | self.imports.keys())
+
+    def _resolve(self, module, level, in_package, package_dir):
+        if in_package and level == 1:
+            return os.path.join(os.path.dirname(self.path), f"{module or '__init__'}.py")
+        for package, directory in (("scene_utils", package_dir), ("build_utils", BUILD_UTILS_DIR)):
+            if level == 0 and module == package:
+                return os.path.join(directory, "__init__.py")
+            if level == 0 and module.startswith(package + "."):
+                return os.path.join(directory, f"{module.split('.', 1)[1]}.py")
+        if level == 0 and module.startswith("Scene"):
+            return os.path.join(os.path.dirname(self.path), f"{module}.py")
+        return None
+
+    def _add_import(self, node, in_package, package_dir):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                target = self._resolve(alias.name, 0, in_package, package_dir)
+                if target is not None:
+                    self.star_imports.append(target)
+            return
+        target = self._resolve(node.module or "", node.level, in_package, package_dir)
+        if target is None:
+            return
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_imports.append(target)
+            else:
+                self.imports[alias.asname or alias.name] = (target, alias.name)
+
+    def symbol_digest(self, name):
+        return _digest("".join(ast.dump(node) for node in self.nodes[name]))
+
+
+def scene_fingerprint(chapter, scene, read=read_file, package_dir=SCENE_UTILS_DIR, literals=None):
+    """
+    Statically resolve exactly which symbols a scene depends on.
+
+    The scene file itself is hashed whole. Every name it imports from
+    scene_utils or build_utils (through the package re-exports) or from a sibling scene
+    (e.g. `from Scene1 import SCENE1_MATRIX_DATA`) is followed to its
+    definition, and from there to every top-level name that definition
+    references, across modules. Names used by the top-level statements of
+    every module reached (such as a setup call in a package's __init__.py)
+    are followed the same way. Editing `CHAPTER9_W_DATA` therefore only
+    changes the fingerprint of scenes that actually use it.
+
+    Args:
+        chapter: Chapter directory name (e.g. "Chapter7")
+        scene: Scene module name (e.g. "Scene2")
+        read: Callable returning a file's source or None (see `git_reader`)
+        literals: Set to add the strings of the scene and of every symbol it
+            depends on to, for finding the asset files it reads (see
+            `scene_assets`)
+
+    Returns:
+        Dict of {"path" or "path:symbol": digest}
+    """
+    literals = set() if literals is None else literals
+    indexes = {}
+
+    def index(path):
+        if path not in indexes:
+            indexes[path] = ModuleIndex(path, read(path), package_dir)
+        return indexes[path]
+
+    scene_path = os.path.join(chapter, f"{scene}.py")
+    source = read(scene_path)
+    fingerprint = {scene_path: _digest(source) if source is not None else "missing"}
+
+    scene_index = index(scene_path)
+    literals.update(_path_literals(scene_index.tree))
+    pending = list(scene_index.imports.values())
+    pending += [(path, "*") for path in scene_index.star_imports]
+    seen = set()
+
+    while pending:
+        path, name = pending.pop()
+        if (path, name) in seen:
+            continue
+        seen.add((path, name))
+        module = index(path)
+
+        if not module.exists:
+            fingerprint[path] = "missing"
+            continue
+        fingerprint[f"{path}:{MODULE_BODY}"] = module.body_digest
+        for node in module.body:
+            literals.update(_path_literals(node))
+        for ref in module.body_refs:
+            pending.append(module.imports.get(ref, (path, ref)))
+
+        if name == "*":
+            pending += [(path, n) for n in module.nodes]
+            pending += list(module.imports.values())
+            pending += [(p, "*") for p in module.star_imports]
+        elif name in module.imports:
+            pending.append(module.imports[name])
+        elif name in module.nodes:
+            fingerprint[f"{path}:{name}"] = module.symbol_digest(name)
+            for node in module.nodes[name]:
+                literals.update(_path_literals(node))
+            for ref in module.refs[name]:
+                pending.append(module.imports.get(ref, (path, ref)))
+        else:
+            fingerprint[f"{path}:{name}"] = "missing"
+
+    return fingerprint
+
+
+def scene_assets(chapter, literals):
+    """
+    Files and directories a scene's strings name, relative to its chapter.
+
+    Scenes render with the chapter directory as working directory, so
+    ``"../imgs"`` is the repo's imgs/ directory. Only paths that exist
+    inside the repo count; render output (media/), the repo root and the
+    chapter directory itself are never assets.
+
+    Args:
+        chapter: Chapter directory name
+        literals: Strings collected by `scene_fingerprint`
+
+    Returns:
+        Sorted list of repo-relative paths
+    """
+    assets = set()
+    for literal in literals:
+        if os.path.isabs(literal):
+            continue
+        path = os.path.normpath(os.path.join(chapter, literal))
+        parts = path.split(os.sep)
+        if path in (".", os.path.normpath(chapter)) or parts[0] in ("..", "media", ".build"):
+            continue
+        if "media" in parts[1:2] or "__pycache__" in parts or path.endswith(".py"):
+            continue
+        if os.path.exists(path):
+            assets.add(path)
+    return sorted(assets)
+
+
+def scene_dependencies(chapter, scene, package_dir=SCENE_UTILS_DIR):
+    """
+    List the source files a scene depends on, including the scene itself.
+
+    Returns:
+        Sorted list of file paths
+    """
+    fingerprint = scene_fingerprint(chapter, scene, package_dir=package_dir)
+    return sorted({label.split(":", 1)[0] for label in fingerprint})
@@ -0,0 +1,163 @@
+import os
+import shutil
+import time
+import uuid
+
+from .manifest import BUILD_DIR, read_json, write_json
+
+FARM_DIR = os.path.join(BUILD_DIR, "farm")
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    File-based scene job queue shared by a coordinator and its workers.
+
+    Each job is a JSON file that moves between the pending/, claimed/, done/
+    and failed/ directories. Claiming is a single rename(), which is atomic,
+    so any number of workers (local processes, or hosts sharing the
+    directory over NFS) can pull from the same queue without a lock. Workers
+    touch their claimed job while it runs; a claim that stops being touched
+    is returned to pending/ by the coordinator.
+
+    Rendered videos are copied into media/<run id>/ under the queue root,
+    using the same ChapterN/media/videos/... layout as a checkout.
+
+    Every `clear` starts a new run with its own id, which prefixes the job
+    ids, so a worker left over from an interrupted run cannot complete a
+    job of the current one.
+    """
+
+    def __init__(self, root=FARM_DIR):
+        self.root = root
+        for state in (PENDING, CLAIMED, DONE, FAILED):
+            os.makedirs(os.path.join(root, state), exist_ok=True)
+
+    def _path(self, state, job_id):
+        return os.path.join(self.root, state, job_id)
+
+    def _jobs(self, state):
+        return sorted(name for name in os.listdir(os.path.join(self.root, state)) if name.endswith(".json"))
+
+    @property
+    def run(self):
+        """Id of the current run, set by the last `clear`."""
+        return read_json(os.path.join(self.root, "run.json")).get("run", "")
+
+    def clear(self):
+        """
+        Drop every job and start a new run, keeping the directories so
+        running workers are not disturbed.
+
+        Returns:
+            The new run id
+        """
+        for state in (PENDING, CLAIMED, DONE, FAILED):
+            for job_id in self._jobs(state):
+                try:
+                    os.unlink(self._path(state, job_id))
+                except FileNotFoundError:
+                    pass
+        # Videos published by earlier runs are not fetched again
+        shutil.rmtree(os.path.join(self.root, "media"), ignore_errors=True)
+        run = uuid.uuid4().hex[:12]
+        write_json(os.path.join(self.root, "run.json"), {"run": run})
+        return run
+
+    def submit(self, job):
+        """Add a job (a JSON-serialisable dict with chapter and scene) to the current run."""
+        run = self.run
+        seq = sum(len(self._jobs(state)) for state in (PENDING, CLAIMED, DONE, FAILED))
+        job_id = f"{run}-{seq:05d}-{job['chapter']}-{job['scene']}.json"
+        write_json(self._path(PENDING, job_id), dict(job, run=run))
+        return job_id
+
+    def claim(self):
+        """
+        Take the oldest pending job.
+
+        Returns:
+            Tuple of (job_id, job dict), or None if nothing is pending
+        """
+        for job_id in self._jobs(PENDING):
+            try:
+                os.rename(self._path(PENDING, job_id), self._path(CLAIMED, job_id))
+            except FileNotFoundError:
+                continue  # another worker got there first
+            os.utime(self._path(CLAIMED, job_id))
+            return job_id, read_json(self._path(CLAIMED, job_id))
+        return None
+
+    def heartbeat(self, job_id):
+        try:
+            os.utime(self._path(CLAIMED, job_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, job_id, result):
+        """
+        Publish a job's result and release the claim.
+
+        Returns:
+            False, publishing nothing, if the job is no longer claimed: its
+            run was cleared, or it was requeued after missing heartbeats
+        """
+        if not os.path.exists(self._path(CLAIMED, job_id)):
+            return False
+        state = DONE if result["returncode"] == 0 else FAILED
+        write_json(self._path(state, job_id), result)
+        try:
+            os.unlink(self._path(CLAIMED, job_id))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def requeue_stale(self, max_age):
+        """Return claims not touched for `max_age` seconds to pending/."""
+        requeued = []
+        for job_id in self._jobs(CLAIMED):
+            path = self._path(CLAIMED, job_id)
+            try:
+                if time.time() - os.path.getmtime(path) > max_age:
+                    os.rename(path, self._path(PENDING, job_id))
+                    requeued.append(job_id)
+            except FileNotFoundError:
+                continue
+        return requeued
+
+    def results(self):
+        """Yield (job_id, result) for every finished job of the current run."""
+        run = self.run
+        for state in (DONE, FAILED):
+            for job_id in self._jobs(state):
+                result = read_json(self._path(state, job_id))
+                if job_id.startswith(f"{run}-") and result.get("run") == run:
+                    yield job_id, result
+
+    def counts(self):
+        return {state: len(self._jobs(state)) for state in (PENDING, CLAIMED, DONE, FAILED)}
+
+    def is_drained(self):
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[CLAIMED] == 0
+
+    def media_path(self, path, run=None):
+        """Location of a checkout-relative media file of a run (default: the current one) inside the shared queue."""
+        return os.path.join(self.root, "media", run or self.run, path)
+
+    def publish(self, path, run=None):
+        """Copy a rendered file from the checkout into the shared media directory of a run."""
+        shared = self.media_path(path, run)
+        os.makedirs(os.path.dirname(shared), exist_ok=True)
+        shutil.copy2(path, shared)
+
+    def fetch(self, path):
+        """Copy a file of the current run from the shared media directory into the checkout."""
+        shared = self.media_path(path)
+        if os.path.exists(path) and os.path.samefile(shared, path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy2(shared, path)
@@ -0,0 +1,56 @@
+import os
+import threading
+from datetime import datetime, timezone
+
+from .manifest import BUILD_DIR, read_json, write_json
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class BuildJournal:
+    """
+    On-disk record of a build_all run, so an interrupted run can be resumed.
+
+    Each scene moves through running -> done or running -> failed, and the
+    journal is rewritten atomically after every transition. A scene left in
+    the running state (the machine rebooted mid-render) counts as unfinished.
+    There is one journal per quality/prod combination.
+    """
+
+    def __init__(self, quality='l', prod=False, resume=False, build_dir=BUILD_DIR):
+        suffix = f"{quality}-prod" if prod else quality
+        self.path = os.path.join(build_dir, f"journal-{suffix}.json")
+        self.lock = threading.Lock()
+        self.data = read_json(self.path) if resume else {}
+        if not self.data:
+            self.data = {"quality": quality, "prod": prod, "started": _now(), "scenes": {}}
+            self.save()
+
+    @staticmethod
+    def key(chapter, scene):
+        return f"{chapter}/{scene}"
+
+    def status(self, chapter, scene):
+        return self.data["scenes"].get(self.key(chapter, scene), {}).get("status", PENDING)
+
+    def unfinished(self, scenes):
+        """Filter (chapter, scene) pairs, in order, down to those not yet done."""
+        return [(c, s) for c, s in scenes if self.status(c, s) != DONE]
+
+    def mark(self, chapter, scene, status, **info):
+        with self.lock:
+            entry = self.data["scenes"].setdefault(self.key(chapter, scene), {"attempts": 0})
+            if status == RUNNING:
+                entry["attempts"] += 1
+            entry.update(info, status=status, updated=_now())
+            self.save()
+
+    def save(self):
+        write_json(self.path, self.data)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+
+from .deps import read_file, scene_assets, scene_fingerprint
+
+BUILD_DIR = ".build"
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+STITCH_MANIFEST_PATH = os.path.join(BUILD_DIR, "stitch.json")
+CONFIG_FILES = ["manim.cfg"]
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def asset_digest(path):
+    """
+    Hash a file, or every file under a directory together with its relative path.
+    """
+    if not os.path.isdir(path):
+        return file_digest(path)
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            digest.update(f"{os.path.relpath(full, path)}={file_digest(full)}\n".encode())
+    return digest.hexdigest()
+
+
+def scene_digest(chapter, scene, settings, read=read_file):
+    """
+    Hash everything that determines a scene's rendered output.
+
+    Covers the scene source, the scene_utils and sibling-scene symbols it
+    uses (see `scene_fingerprint`), the images and other files those name
+    (see `scene_assets`; always hashed as they are in the working tree),
+    manim.cfg (repo root and chapter), and the render settings.
+
+    Args:
+        chapter: Chapter directory name
+        scene: Scene module name
+        settings: Dict of render settings (quality, PROD_MODE, VOICE_SERVICE, ...)
+        read: Source reader, e.g. `git_reader(rev)` to hash an older revision
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    literals = set()
+    inputs = scene_fingerprint(chapter, scene, read, literals=literals)
+    for path in scene_assets(chapter, literals):
+        inputs[f"asset:{path}"] = asset_digest(path)
+    for path in CONFIG_FILES + [os.path.join(chapter, f) for f in CONFIG_FILES]:
+        source = read(path)
+        if source is not None:
+            inputs[path] = hashlib.sha256(source.encode()).hexdigest()
+    for label in sorted(inputs):
+        digest.update(f"{label}={inputs[label]}\n".encode())
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def write_json(path, data):
+    """Atomically write data as JSON, creating parent directories."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def read_json(path, default=None):
+    """Read a JSON file, returning `default` if it is missing or corrupt."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+class BuildManifest:
+    """
+    Record of the input hash each scene output was last rendered from.
+
+    Entries are keyed by "ChapterN/SceneN@quality" and store the digest plus
+    the size of the output mp4, so a missing or replaced output is rebuilt.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.entries = read_json(path)
+
+    @staticmethod
+    def key(chapter, scene, quality):
+        return f"{chapter}/{scene}@{quality}"
+
+    def is_current(self, chapter, scene, quality, digest, output):
+        entry = self.entries.get(self.key(chapter, scene, quality))
+        if entry is None or entry["digest"] != digest or not os.path.exists(output):
+            return False
+        return entry["size"] == os.path.getsize(output)
+
+    def record(self, chapter, scene, quality, digest, output):
+        if not os.path.exists(output):
+            return
+        self.entries[self.key(chapter, scene, quality)] = {
+            "digest": digest,
+            "output": output,
+            "size": os.path.getsize(output),
+        }
+        self.save()
+
+    def save(self):
+        write_json(self.path, self.entries)
+
+
+class StitchManifest:
+    """
+    Record of the scene videos each stitched chapter was made from.
+
+    Entries are keyed by "ChapterN@quality" (with "+ladder" when the lower
+    renditions were derived too) and store a digest of the input videos
+    plus the size of every output, so a chapter whose scenes have not
+    changed is neither stitched nor re-encoded again.
+    """
+
+    def __init__(self, path=STITCH_MANIFEST_PATH):
+        self.path = path
+        self.entries = read_json(path)
+
+    @staticmethod
+    def key(chapter, quality, ladder=False):
+        return f"{chapter}@{quality}" + ("+ladder" if ladder else "")
+
+    @staticmethod
+    def inputs_digest(paths):
+        """Hash the input videos, in stitching order."""
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(f"{os.path.basename(path)}={file_digest(path)}\n".encode())
+        return digest.hexdigest()
+
+    def is_current(self, chapter, quality, ladder, digest, outputs):
+        entry = self.entries.get(self.key(chapter, quality, ladder))
+        if entry is None or entry["digest"] != digest:
+            return False
+        return all(
+            os.path.exists(output) and entry["sizes"].get(output) == os.path.getsize(output)
+            for output in outputs
+        )
+
+    def record(self, chapter, quality, ladder, digest, outputs):
+        if not all(os.path.exists(output) for output in outputs):
+            return
+        self.entries[self.key(chapter, quality, ladder)] = {
+            "digest": digest,
+            "sizes": {output: os.path.getsize(output) for output in outputs},
+        }
+        self.save()
+
+    def save(self):
+        write_json(self.path, self.entries)
@@ -0,0 +1,240 @@
+import json
+import os
+import subprocess
+from collections import Counter
+
+# ffprobe codec names -> ffmpeg encoders used when a scene must be conformed
+ENCODERS = {"h264": "libx264", "hevc": "libx265", "aac": "aac", "mp3": "libmp3lame"}
+
+
+def probe(path):
+    """
+    Read stream, container and chapter information for a media file with ffprobe.
+
+    Returns:
+        Parsed ffprobe JSON with "streams", "format" and "chapters" keys
+    """
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-show_chapters", "-of", "json", path],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def _stream(info, codec_type):
+    for stream in info["streams"]:
+        if stream["codec_type"] == codec_type:
+            return stream
+    return None
+
+
+def stream_signature(info):
+    """
+    Extract the parameters that must match for a lossless concat.
+
+    Returns:
+        Hashable tuple of video and audio parameters (audio is None if absent)
+    """
+    video = _stream(info, "video")
+    audio = _stream(info, "audio")
+    video_sig = (
+        video["codec_name"], video.get("profile"), video["pix_fmt"],
+        video["width"], video["height"], video["r_frame_rate"], video["time_base"],
+    )
+    audio_sig = None
+    if audio is not None:
+        audio_sig = (
+            audio["codec_name"], audio["sample_rate"], audio["channels"],
+            audio.get("channel_layout"), audio["time_base"],
+        )
+    return video_sig, audio_sig
+
+
+def describe_signature(signature):
+    (vcodec, _, pix_fmt, width, height, fps, tb), audio = signature
+    text = f"{vcodec} {width}x{height} {pix_fmt} @ {fps} fps (tb {tb})"
+    if audio is None:
+        return text + ", no audio"
+    acodec, rate, channels, _, _ = audio
+    return text + f", {acodec} {rate} Hz x{channels}"
+
+
+def reference_signature(signatures):
+    """Pick the signature shared by most inputs, so the common case is a pure copy."""
+    return Counter(signatures).most_common(1)[0][0]
+
+
+def conform_command(src, dst, reference):
+    """
+    Build an ffmpeg command re-encoding `src` to match a reference signature.
+
+    A missing audio track is replaced with silence so the concat demuxer sees
+    the same stream layout in every input.
+
+    Returns:
+        Argument list for subprocess
+    """
+    (vcodec, _, pix_fmt, width, height, fps, tb), audio = reference
+    timescale = tb.split("/")[1]
+    has_audio = _stream(probe(src), "audio") is not None
+
+    command = ["ffmpeg", "-y", "-v", "error", "-i", src]
+    if audio is not None and not has_audio:
+        acodec, rate, channels, layout, _ = audio
+        command += ["-f", "lavfi", "-i", f"anullsrc=r={rate}:cl={layout or 'stereo'}", "-shortest"]
+    command += ["-map", "0:v:0"]
+    if audio is not None:
+        command += ["-map", "0:a:0" if has_audio else "1:a:0"]
+
+    command += [
+        "-vf", f"scale={width}:{height},fps={fps}",
+        "-c:v", ENCODERS.get(vcodec, vcodec), "-pix_fmt", pix_fmt,
+        "-video_track_timescale", timescale,
+    ]
+    if audio is not None:
+        acodec, rate, channels, _, _ = audio
+        command += ["-c:a", ENCODERS.get(acodec, acodec), "-ar", str(rate), "-ac", str(channels)]
+    return command + [dst]
+
+
+def chapter_metadata(titles_and_durations):
+    """
+    Build an FFMETADATA document with one chapter marker per scene.
+
+    Args:
+        titles_and_durations: List of (title, duration in seconds) in play order
+
+    Returns:
+        Metadata file contents as a string
+    """
+    lines = [";FFMETADATA1"]
+    start = 0
+    for title, duration in titles_and_durations:
+        end = start + int(round(duration * 1000))
+        lines += ["[CHAPTER]", "TIMEBASE=1/1000", f"START={start}", f"END={end}", f"title={title}"]
+        start = end
+    return "\n".join(lines) + "\n"
+
+
+def ladder_command(src, renditions):
+    """
+    Build one ffmpeg command deriving several lower renditions from `src`.
+
+    The source is decoded once and split; each branch is scaled and
+    frame-rate converted, then encoded to its own output. Audio and chapter
+    markers are copied unchanged, and a keyframe is forced at every chapter
+    start so renditions can be segmented at scene boundaries.
+
+    Args:
+        src: Path of the top rendition
+        renditions: List of (output path, width, height, fps)
+
+    Returns:
+        Argument list for subprocess
+    """
+    labels = [f"v{i}" for i in range(len(renditions))]
+    graph = f"[0:v]split={len(renditions)}" + "".join(f"[s{i}]" for i in range(len(renditions)))
+    for i, (_, width, height, fps) in enumerate(renditions):
+        graph += f";[s{i}]scale={width}:{height},fps={fps}[{labels[i]}]"
+
+    command = ["ffmpeg", "-y", "-v", "error", "-i", src, "-filter_complex", graph]
+    for label, (dst, _, _, fps) in zip(labels, renditions):
+        command += [
+            "-map", f"[{label}]", "-map", "0:a?", "-map_chapters", "0",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "20", "-g", str(fps * 2),
+            "-force_key_frames", "chapters",
+            "-c:a", "copy", "-movflags", "+faststart", dst,
+        ]
+    return command
+
+
+def segment_times(info, segment_time=6):
+    """
+    Choose HLS cut points: every chapter (scene) start, plus a cut every
+    `segment_time` seconds within a scene so seeking stays fine-grained.
+
+    Args:
+        info: ffprobe result for the stitched chapter video
+        segment_time: Target segment length in seconds
+
+    Returns:
+        Sorted list of cut times in seconds, excluding 0
+    """
+    duration = float(info["format"]["duration"])
+    starts = sorted(float(c["start_time"]) for c in info.get("chapters", []))
+    if not starts or starts[0] > 0:
+        starts.insert(0, 0.0)
+
+    times = []
+    for start, end in zip(starts, starts[1:] + [duration]):
+        if start > 0:
+            times.append(start)
+        t = start + segment_time
+        while t < end - segment_time / 2:
+            times.append(t)
+            t += segment_time
+    return times
+
+
+def hls_command(src, out_dir, times):
+    """
+    Build an ffmpeg command that stream-copies `src` into an HLS media playlist.
+
+    Segments are cut at the given times (at the next keyframe), so scene
+    boundaries line up with segment boundaries without re-encoding.
+
+    Returns:
+        Argument list for subprocess
+    """
+    return [
+        "ffmpeg", "-y", "-v", "error", "-i", src, "-map", "0:v", "-map", "0:a?", "-c", "copy",
+        "-f", "segment", "-segment_format", "mpegts",
+        "-segment_times", ",".join(f"{t:.3f}" for t in times),
+        "-segment_list", os.path.join(out_dir, "index.m3u8"), "-segment_list_type", "m3u8",
+        os.path.join(out_dir, "segment%04d.ts"),
+    ]
+
+
+def master_playlist(variants):
+    """
+    Build an HLS master playlist.
+
+    Args:
+        variants: List of (media playlist URI, bandwidth in bit/s, width, height, fps),
+            highest quality first
+
+    Returns:
+        Playlist contents as a string
+    """
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for uri, bandwidth, width, height, fps in variants:
+        lines.append(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={width}x{height},FRAME-RATE={fps:.3f}"
+        )
+        lines.append(uri)
+    return "\n".join(lines) + "\n"
+
+
+def image_variants_command(src, outputs):
+    """
+    Build one ffmpeg command writing several re-encoded/downscaled copies of an image.
+
+    Args:
+        src: Source image path
+        outputs: List of (output path, width or None for full size); the
+            format follows the output extension (.webp, .png, ...)
+
+    Returns:
+        Argument list for subprocess
+    """
+    graph = f"[0:v]split={len(outputs)}" + "".join(f"[s{i}]" for i in range(len(outputs)))
+    for i, (_, width) in enumerate(outputs):
+        graph += f";[s{i}]scale={width}:-2[o{i}]" if width else f";[s{i}]null[o{i}]"
+
+    command = ["ffmpeg", "-y", "-v", "error", "-i", src, "-filter_complex", graph]
+    for i, (dst, _) in enumerate(outputs):
+        command += ["-map", f"[o{i}]", "-frames:v", "1"]
+        if dst.endswith(".webp"):
+            command += ["-c:v", "libwebp", "-quality", "85"]
+        command.append(dst)
+    return command
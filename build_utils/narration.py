@@ -0,0 +1,47 @@
+import ast
+
+from .deps import read_file
+
+
+def voiceover_texts(path, read=read_file):
+    """
+    Statically extract the narration of a scene file.
+
+    Finds every ``self.voiceover(text=...)`` call and evaluates its text
+    when it is a literal (including implicitly concatenated strings).
+    Text built at render time, such as an f-string or a dict lookup inside
+    a loop, cannot be known without running the scene and is reported
+    separately; it is synthesised on demand during the render instead.
+
+    Args:
+        path: Scene file path
+        read: Callable returning a file's source or None (see `git_reader`)
+
+    Returns:
+        Tuple of (texts in source order, line numbers of dynamic calls)
+    """
+    source = read(path)
+    if source is None:
+        return [], []
+
+    texts = []
+    dynamic = []
+    for node in ast.walk(ast.parse(source, filename=path)):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "voiceover"):
+            continue
+        text = next((kw.value for kw in node.keywords if kw.arg == "text"), None)
+        if text is None and node.args:
+            text = node.args[0]
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, TypeError, SyntaxError):
+            dynamic.append(node.lineno)
+            continue
+        if isinstance(value, str):
+            texts.append((node.lineno, value))
+        else:
+            dynamic.append(node.lineno)
+
+    texts.sort()
+    return [text for _, text in texts], sorted(dynamic)
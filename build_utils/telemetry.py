@@ -0,0 +1,98 @@
+import glob
+import os
+from datetime import datetime, timezone
+
+from .manifest import BUILD_DIR, read_json, write_json
+
+REPORT_DIR = os.path.join(BUILD_DIR, "reports")
+
+
+def scene_media_stats(chapter, scene, resolution):
+    """
+    Collect what a finished render left on disk for a scene.
+
+    The number of animations is the length of manim's partial movie file
+    list for the final video; the partial movie file count also includes
+    stale files kept in manim's cache. Speech timings come from the
+    telemetry sidecar written by `scene_utils.setup_scene`.
+
+    Returns:
+        Dict of animations, partial_movie_files, output_bytes, speech_calls
+        and speech_seconds
+    """
+    video_dir = os.path.join(chapter, "media", "videos", scene, resolution)
+    output = os.path.join(video_dir, f"{scene}.mp4")
+    list_files = glob.glob(os.path.join(video_dir, "partial_movie_files", "*", "partial_movie_file_list.txt"))
+
+    animations = 0
+    for list_file in list_files:
+        with open(list_file) as f:
+            animations += sum(1 for line in f if line.startswith("file "))
+
+    speech = read_json(os.path.join(chapter, "media", "telemetry", f"{scene}.json"))
+    return {
+        "animations": animations,
+        "partial_movie_files": len(glob.glob(os.path.join(video_dir, "partial_movie_files", "*", "*.mp4"))),
+        "output_bytes": os.path.getsize(output) if os.path.exists(output) else 0,
+        "speech_calls": speech.get("calls", 0),
+        "speech_seconds": speech.get("seconds", 0.0),
+    }
+
+
+class BuildReport:
+    """
+    Per-scene render telemetry for one build, written as JSON plus a text
+    summary that ranks scenes by wall time.
+    """
+
+    def __init__(self, quality='l', prod=False):
+        self.data = {
+            "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "quality": quality,
+            "prod": prod,
+            "scenes": [],
+            "stitches": [],
+        }
+
+    def add_scene(self, chapter, scene, returncode, stats):
+        self.data["scenes"].append(dict(stats, chapter=chapter, scene=scene, returncode=returncode))
+
+    def add_stitch(self, chapter, seconds):
+        self.data["stitches"].append({"chapter": chapter, "wall_seconds": seconds})
+
+    def summary(self):
+        scenes = sorted(self.data["scenes"], key=lambda s: s["wall_seconds"], reverse=True)
+        total_wall = sum(s["wall_seconds"] for s in scenes)
+        lines = [
+            f"Build report {self.data['started']} (quality {self.data['quality']}"
+            f"{', prod' if self.data['prod'] else ''})",
+            "",
+            f"{'scene':<18} {'wall s':>8} {'cpu s':>8} {'rss MB':>7} {'speech s':>8} "
+            f"{'anims':>6} {'partials':>8} {'out MB':>7}  status",
+        ]
+        for s in scenes:
+            lines.append(
+                f"{s['chapter'] + '/' + s['scene']:<18} {s['wall_seconds']:>8.1f} {s['cpu_seconds']:>8.1f} "
+                f"{s['max_rss_bytes'] / 2**20:>7.0f} {s['speech_seconds']:>8.1f} {s['animations']:>6} "
+                f"{s['partial_movie_files']:>8} {s['output_bytes'] / 2**20:>7.1f}  "
+                f"{'ok' if s['returncode'] == 0 else 'FAILED'}"
+            )
+        for stitch in self.data["stitches"]:
+            lines.append(f"stitch {stitch['chapter']:<11} {stitch['wall_seconds']:>8.1f}")
+        lines += ["", f"{len(scenes)} scene(s), {total_wall:.1f}s of render wall time"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, report_dir=REPORT_DIR):
+        """
+        Write report-<timestamp>.json/.txt and refresh latest.json/.txt.
+
+        Returns:
+            Path of the text summary
+        """
+        stamp = self.data["started"].replace(":", "").replace("-", "").replace("+0000", "")
+        summary = self.summary()
+        for name in (f"report-{stamp}", "latest"):
+            write_json(os.path.join(report_dir, f"{name}.json"), self.data)
+            with open(os.path.join(report_dir, f"{name}.txt"), "w") as f:
+                f.write(summary)
+        return os.path.join(report_dir, "latest.txt")
@@ -0,0 +1,74 @@
+import ast
+
+from .deps import read_file
+
+TEX_CLASSES = ("MathTex", "Tex", "SingleStringMathTex")
+# Keyword arguments that change the TeX manim compiles; the rest (color,
+# font_size, ...) only affect the mobject and are dropped
+TEX_KWARGS = ("arg_separator", "substrings_to_isolate", "tex_environment")
+
+
+def _call_name(node):
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def tex_calls(path, read=read_file):
+    """
+    Statically extract the Tex expressions a source file compiles.
+
+    Every MathTex, Tex or SingleStringMathTex call whose strings are
+    literals is returned with the keyword arguments that affect
+    compilation. Calls built from runtime values (e.g. ``MathTex(str(i))``)
+    or using ``tex_to_color_map`` are counted but not returned.
+
+    Args:
+        path: Source file path
+        read: Callable returning a file's source or None (see `git_reader`)
+
+    Returns:
+        Tuple of (list of (class name, args tuple, kwargs dict), number of
+        dynamic calls)
+    """
+    source = read(path)
+    if source is None:
+        return [], 0
+
+    calls = []
+    dynamic = 0
+    for node in ast.walk(ast.parse(source, filename=path)):
+        if not isinstance(node, ast.Call) or _call_name(node) not in TEX_CLASSES:
+            continue
+        try:
+            if any(isinstance(arg, ast.Starred) for arg in node.args):
+                raise ValueError("starred arguments")
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg == "tex_to_color_map" or keyword.arg is None:
+                    raise ValueError("isolation depends on runtime values")
+                if keyword.arg in TEX_KWARGS:
+                    value = ast.literal_eval(keyword.value)
+                    kwargs[keyword.arg] = tuple(value) if isinstance(value, list) else value
+        except (ValueError, TypeError, SyntaxError):
+            dynamic += 1
+            continue
+        if args and all(isinstance(arg, str) for arg in args):
+            calls.append((_call_name(node), args, kwargs))
+        else:
+            dynamic += 1
+    return calls, dynamic
+
+
+def numeric_label_calls(symbols=".-+"):
+    """
+    MathTex calls the glyph atlas behind `scene_utils.numeric_label` compiles.
+
+    Numeric labels are composed from the ten digits, typeset together once,
+    and from any other symbol typeset after a "0" on first use.
+    """
+    digits = ("MathTex", tuple("0123456789"), {"arg_separator": ""})
+    return [digits] + [("MathTex", ("0", symbol), {"arg_separator": ""}) for symbol in symbols]
@@ -0,0 +1,19 @@
+// Stream chapter videos from their HLS master playlist when one has been
+// published, falling back to the progressive mp4 in the video's src.
+document.querySelectorAll("video[data-hls]").forEach(function (video) {
+  var playlist = video.dataset.hls;
+  fetch(playlist, { method: "HEAD" })
+    .then(function (response) {
+      if (!response.ok) {
+        return;
+      }
+      if (video.canPlayType("application/vnd.apple.mpegurl")) {
+        video.src = playlist;
+      } else if (window.Hls && Hls.isSupported()) {
+        var hls = new Hls();
+        hls.loadSource(playlist);
+        hls.attachMedia(video);
+      }
+    })
+    .catch(function () {});
+});
@@ -1,3 +1,5 @@
+import os
+
 from .logos import create_logo_grid, LOGO_FILENAMES
 from .matrix_utils import (
     CHAPTER0_MATRIX_DATA,
@@ -16,6 +18,8 @@ from .matrix_utils import (
     create_labeled_matrix,
     create_sparse_matrix,
     create_incidence_matrices,
+    sparse_entries,
+    SparseMatrixMobject,
     hide_zero_entries,
     get_non_zero_positions,
     get_zero_positions,
@@ -31,12 +35,46 @@ from .graph_utils import (
     create_hyperedge_region,
     create_bipartite_graph,
     get_edge_between_vertices,
+    get_edges_between,
     highlight_triangle,
+    highlight_edge_sets,
+    triangle_edges,
+    path_edges,
     color_nodes_by_value,
     create_karate_graph,
+    EdgeBatch,
+    cached_layout,
+    force_layout,
+    get_layout_cache_dir,
     KARATE_EDGES,
     KARATE_TRIANGLE_COUNTS,
     KARATE_TOTAL_TRIANGLES,
     KARATE_TRIANGLE_CENTRALITY,
 )
+from .labels import GlyphAtlas, get_glyph_atlas, numeric_label
+from .matrix_lod import LODMatrixMobject, coo_arrays, density_image, lod_level
 from .speech import get_speech_service, setup_scene, is_prod_mode
+from .tts_cache import (
+    TTSCache,
+    get_tts_cache_dir,
+    narration_key,
+    normalize_narration,
+    prefetch_narration,
+    use_tts_cache,
+)
+from .offline_speech import OfflineService, narration_duration
+from .narration_timing import (
+    NarrationModel,
+    calibrate_narration_model,
+    estimate_narration,
+    load_narration_model,
+)
+from .elevenlabs_async import AsyncElevenLabsService, ElevenLabsClient
+from .audio_post import postprocess_clip, processed_clip, use_audio_postprocess
+from .tex_cache import GLOBAL_TEX_CACHE_ENV, compile_tex_calls, get_tex_cache_dir, use_global_tex_cache
+
+# Every scene imports scene_utils, so renders started by invoke (see scene_env
+# in tasks.py) are all pointed at the shared Tex cache here; other importers,
+# such as notebooks, keep manim's defaults
+if os.environ.get(GLOBAL_TEX_CACHE_ENV) == "1":
+    use_global_tex_cache()
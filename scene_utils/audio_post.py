@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+
+from .tts_cache import TTSCache, _atomic_copy
+
+# Integrated loudness (LUFS) and true peak (dBTP) every clip is brought to
+DEFAULT_LOUDNESS = -16.0
+TRUE_PEAK = -1.5
+# Anything quieter than this at either end of a clip counts as silence
+SILENCE_THRESHOLD = "-50dB"
+# Silence kept at each end so words are not clipped
+SILENCE_KEEP = 0.05
+
+
+def trim_filter():
+    """ffmpeg filter removing leading and trailing silence."""
+    trim = f"silenceremove=start_periods=1:start_threshold={SILENCE_THRESHOLD}:start_silence={SILENCE_KEEP}"
+    return f"{trim},areverse,{trim},areverse"
+
+
+def measure_loudness(path, loudness=DEFAULT_LOUDNESS):
+    """
+    First loudnorm pass: measure a clip after trimming.
+
+    Returns:
+        Dict of the measured_* values loudnorm needs for a linear second pass
+    """
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostats", "-i", str(path),
+         "-af", f"{trim_filter()},loudnorm=I={loudness}:TP={TRUE_PEAK}:LRA=11:print_format=json",
+         "-f", "null", "-"],
+        capture_output=True, text=True, check=True,
+    )
+    stats = json.loads(re.findall(r"\{[^{}]*\}", result.stderr)[-1])
+    return {
+        "measured_I": stats["input_i"],
+        "measured_TP": stats["input_tp"],
+        "measured_LRA": stats["input_lra"],
+        "measured_thresh": stats["input_thresh"],
+        "offset": stats["target_offset"],
+    }
+
+
+def postprocess_clip(src, dest, loudness=DEFAULT_LOUDNESS):
+    """
+    Trim silence from a clip and normalise its loudness into `dest` (MP3).
+
+    Loudness is normalised in two passes, so the gain applied is linear and
+    short clips are not pumped by loudnorm's dynamic mode.
+    """
+    measured = measure_loudness(src, loudness)
+    loudnorm = ":".join(
+        [f"loudnorm=I={loudness}", f"TP={TRUE_PEAK}", "LRA=11", "linear=true"]
+        + [f"{name}={value}" for name, value in measured.items()]
+    )
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", str(src),
+         "-af", f"{trim_filter()},{loudnorm}",
+         "-ar", "44100", "-c:a", "libmp3lame", "-b:a", "128k", str(dest)],
+        check=True,
+    )
+
+
+def postprocess_loudness():
+    """
+    Loudness target scenes normalise narration to, from TTS_LOUDNESS, or
+    None if TTS_POSTPROCESS=0 turns post-processing off.
+    """
+    if os.environ.get("TTS_POSTPROCESS", "1") == "0":
+        return None
+    return float(os.environ.get("TTS_LOUDNESS", DEFAULT_LOUDNESS))
+
+
+def processed_clip(raw, loudness=DEFAULT_LOUDNESS, cache=None):
+    """
+    Trimmed, loudness-normalised version of a raw clip, made only once.
+
+    The result is kept in the TTS cache under processed/, keyed by the raw
+    audio and the processing settings.
+
+    Returns:
+        Tuple of (path of the processed clip, its key)
+    """
+    cache = cache or TTSCache()
+    settings = f"{trim_filter()}|I={loudness}|TP={TRUE_PEAK}"
+    with open(raw, "rb") as f:
+        key = hashlib.sha256(f.read() + settings.encode()).hexdigest()
+    processed = os.path.join(cache.root, "processed", key[:2], f"{key}.mp3")
+    if not os.path.exists(processed):
+        os.makedirs(os.path.dirname(processed), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(processed), suffix=".mp3")
+        os.close(fd)
+        try:
+            postprocess_clip(raw, tmp, loudness)
+            os.replace(tmp, processed)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return processed, key
+
+
+def use_audio_postprocess(service, loudness=DEFAULT_LOUDNESS, cache=None):
+    """
+    Give a speech service trimmed, loudness-normalised clips.
+
+    Each raw clip is processed once: the result is stored in the TTS cache
+    under processed/, keyed by the raw audio and the processing settings,
+    and copied next to the raw clip in the local voiceover cache under a
+    name carrying that key. The scene plays the processed clip, so its
+    timing follows the trimmed length; the raw clip stays recorded as
+    raw_audio.
+
+    Args:
+        service: A manim-voiceover SpeechService
+        loudness: Target integrated loudness in LUFS
+        cache: TTSCache holding processed clips. Defaults to the global one.
+
+    Returns:
+        The same service, with generate_from_text wrapped
+    """
+    cache = cache or TTSCache()
+    generate = service.generate_from_text
+
+    def processed_generate(text, cache_dir=None, path=None, **kwargs):
+        result = generate(text, cache_dir=cache_dir, path=path, **kwargs)
+        # A local cache hit returns the entry written below, whose
+        # original_audio is an earlier processed clip; start from its raw clip
+        # so a change of settings is applied to it
+        raw_name = result.get("raw_audio", result["original_audio"])
+
+        local_dir = Path(cache_dir or service.cache_dir)
+        raw = local_dir / raw_name
+        processed, key = processed_clip(raw, loudness, cache)
+
+        name = f"{raw.stem}.processed-{key[:12]}.mp3"
+        if not (local_dir / name).exists():
+            _atomic_copy(processed, str(local_dir / name))
+        return dict(result, raw_audio=raw_name, original_audio=name)
+
+    service.generate_from_text = processed_generate
+    return service
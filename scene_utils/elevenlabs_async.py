@@ -0,0 +1,203 @@
+import asyncio
+import http.client
+import json
+import os
+import threading
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from dotenv import find_dotenv, load_dotenv
+from manim_voiceover.services.base import SpeechService
+
+from .tts_cache import BOOKMARK_PATTERN, normalize_narration
+
+# Point ELEVENLABS_BASE_URL at a local stub server to test without the real API
+DEFAULT_ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
+# Concurrent requests allowed by the account's plan
+DEFAULT_ELEVENLABS_CONCURRENCY = 4
+
+
+class ElevenLabsClient:
+    """
+    Asyncio client for the ElevenLabs REST API over a pool of keep-alive
+    connections.
+
+    At most `concurrency` requests are in flight; each one borrows an idle
+    connection (opening one only if none is idle) and returns it afterwards,
+    so TLS handshakes are paid once per connection rather than per
+    voiceover. Requests are sent from worker threads, since http.client is
+    blocking. Rate-limit (429) and server errors are retried with
+    exponential backoff.
+    """
+
+    def __init__(self, api_key, base_url=DEFAULT_ELEVENLABS_BASE_URL, concurrency=DEFAULT_ELEVENLABS_CONCURRENCY,
+                 timeout=120, retries=4, backoff=2):
+        url = urlsplit(base_url)
+        self.api_key = api_key
+        self.host = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.idle = []
+        self.connections_opened = 0
+
+    def _connect(self):
+        self.connections_opened += 1
+        return self.connection_class(self.host, timeout=self.timeout)
+
+    def _roundtrip(self, connection, method, path, body):
+        headers = {"xi-api-key": self.api_key, "Accept": "*/*"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        connection.request(method, self.prefix + path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def _send(self, connection, method, path, body):
+        try:
+            return connection, self._roundtrip(connection, method, path, body)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # The server closed an idle keep-alive connection; reconnect once
+            connection.close()
+            connection = self._connect()
+            return connection, self._roundtrip(connection, method, path, body)
+
+    async def request(self, method, path, payload=None):
+        """Send one request and return the response body."""
+        body = json.dumps(payload) if payload is not None else None
+        async with self.semaphore:
+            connection = self.idle.pop() if self.idle else self._connect()
+            try:
+                for attempt in range(self.retries + 1):
+                    connection, (status, data) = await asyncio.to_thread(
+                        self._send, connection, method, path, body,
+                    )
+                    if status < 400:
+                        break
+                    if (status != 429 and status < 500) or attempt == self.retries:
+                        raise RuntimeError(f"ElevenLabs {method} {path} failed ({status}): {data[:200]!r}")
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+            except BaseException:
+                connection.close()
+                raise
+            self.idle.append(connection)
+            return data
+
+    async def voices(self):
+        return json.loads(await self.request("GET", "/v1/voices"))["voices"]
+
+    async def text_to_speech(self, text, voice_id, model, output_format):
+        return await self.request(
+            "POST",
+            f"/v1/text-to-speech/{quote(voice_id)}?output_format={quote(output_format)}",
+            {"text": text, "model_id": model},
+        )
+
+
+class AsyncElevenLabsService(SpeechService):
+    """
+    ElevenLabs speech service that synthesises concurrently.
+
+    Requests run on an asyncio event loop in a background thread through a
+    pooled ElevenLabsClient. generate_from_text is thread-safe, so it can be
+    called from many threads at once (as `prefetch_narration` does), and
+    `pipeline` starts synthesising texts in the background so that later
+    voiceovers are ready by the time the scene reaches them.
+    """
+
+    def __init__(self, voice_name="michelp", model="eleven_monolingual_v1", output_format="mp3_44100_128",
+                 api_key=None, base_url=None, concurrency=None, **kwargs):
+        """
+        Args:
+            voice_name: Name of the ElevenLabs voice
+            model: ElevenLabs model id
+            output_format: ElevenLabs output format
+            api_key: Defaults to ELEVEN_API_KEY (read from .env if present)
+            base_url: Defaults to ELEVENLABS_BASE_URL, else the public API
+            concurrency: Requests in flight. Defaults to ELEVENLABS_CONCURRENCY, else 4.
+        """
+        load_dotenv(find_dotenv(usecwd=True))
+        SpeechService.__init__(self, **kwargs)
+        self.voice_name = voice_name
+        self.model = model
+        self.output_format = output_format
+
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.client = ElevenLabsClient(
+            api_key or os.environ.get("ELEVEN_API_KEY", ""),
+            base_url or os.environ.get("ELEVENLABS_BASE_URL") or DEFAULT_ELEVENLABS_BASE_URL,
+            int(concurrency or os.environ.get("ELEVENLABS_CONCURRENCY", DEFAULT_ELEVENLABS_CONCURRENCY)),
+        )
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+
+        from elevenlabs import Voice
+
+        voices = self._run(self.client.voices()).result()
+        matching = [v for v in voices if v["name"] == voice_name]
+        if not matching:
+            available = ", ".join(sorted(v["name"] for v in voices)) or "none"
+            raise ValueError(f"ElevenLabs voice {voice_name!r} not found (available: {available})")
+        # Parsed as the elevenlabs package does, so input_data matches the
+        # cache.json entries written by manim-voiceover's ElevenLabsService
+        self.voice = Voice(**matching[0])
+        self.voice_id = self.voice.voice_id
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def _synthesis(self, text):
+        """Future for the audio of `text`, starting the request if needed."""
+        spoken = normalize_narration(text)
+        with self.pending_lock:
+            if spoken not in self.pending:
+                self.pending[spoken] = self._run(
+                    self.client.text_to_speech(spoken, self.voice_id, self.model, self.output_format)
+                )
+            return self.pending[spoken]
+
+    def input_data(self, text):
+        """Cache entry key of `text`, in the shape manim-voiceover's ElevenLabsService uses."""
+        return {
+            "input_text": BOOKMARK_PATTERN.sub("", text),
+            "service": "elevenlabs",
+            "config": {"model": self.model, "voice": self.voice.model_dump(exclude_none=True)},
+        }
+
+    def pipeline(self, texts):
+        """Start synthesising `texts` in the background, skipping cached ones."""
+        cached = getattr(self, "cached_narration", lambda text: None)
+        for text in texts:
+            # Scenes see whitespace-collapsed text, as manim-voiceover passes it on
+            text = " ".join(text.split())
+            if cached(text) is None and self.get_cached_result(self.input_data(text), Path(self.cache_dir)) is None:
+                self._synthesis(text)
+
+    def generate_from_text(self, text, cache_dir=None, path=None, **kwargs):
+        if cache_dir is None:
+            cache_dir = self.cache_dir
+
+        input_data = self.input_data(text)
+        cached_result = self.get_cached_result(input_data, Path(cache_dir))
+        if cached_result is not None:
+            return cached_result
+
+        audio_path = path or self.get_audio_basename(input_data) + ".mp3"
+        future = self._synthesis(text)
+        try:
+            audio = future.result()
+        finally:
+            with self.pending_lock:
+                self.pending.pop(normalize_narration(text), None)
+        with open(Path(cache_dir) / audio_path, "wb") as f:
+            f.write(audio)
+
+        return {
+            "input_text": text,
+            "input_data": input_data,
+            "original_audio": audio_path,
+        }
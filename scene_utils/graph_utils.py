@@ -1,7 +1,14 @@
 from manim import *
+import hashlib
+import json
 import math
+import os
+import tempfile
+
 import numpy as np
 
+from .labels import numeric_label
+
 
 def set_vertex_fill_preserve_label(vertex, color, opacity=1):
     """
@@ -43,7 +50,8 @@ def create_adjacency_digraph(matrix_data, layout="triangle", scale=1, edge_color
     Args:
         matrix_data: 2D list representing the adjacency matrix
         layout: Layout algorithm for graph positioning (default: "kamada_kawai")
-                Can also be "triangle" for a fixed equilateral triangle layout (6 nodes)
+                Can also be "triangle" for a fixed equilateral triangle layout (6 nodes),
+                or "force" for a cached force-directed layout (see `cached_layout`)
         scale: Scale factor for the graph (default: 1.3)
         edge_color: Color for the edges (default: BLUE)
         edge_labels: If True, return (graph, labels_group) with edge weight labels
@@ -61,7 +69,7 @@ def create_adjacency_digraph(matrix_data, layout="triangle", scale=1, edge_color
 
     # Create labels manually with color=BLACK to work around Manim bug
     # (DiGraph uses fill_color= but MathTex requires color=)
-    labels = {v: MathTex(v, color=BLACK) for v in nodes}
+    labels = {v: numeric_label(v, color=BLACK) for v in nodes}
 
     # Handle custom triangle layout for 6-node graphs
     if layout == "triangle" and num_rows == 6:
@@ -77,6 +85,8 @@ def create_adjacency_digraph(matrix_data, layout="triangle", scale=1, edge_color
         layout = positions
     else:
         positions = None
+        if layout == "force":
+            layout = cached_layout(nodes, edges)
 
     graph = DiGraph(
         vertices=nodes,
@@ -85,6 +95,8 @@ def create_adjacency_digraph(matrix_data, layout="triangle", scale=1, edge_color
         labels=labels,
         edge_config={"stroke_color": edge_color}
     ).scale(scale)
+    # DiGraph already keys its edges by (i, j)
+    graph.edge_dict = graph.edges
 
     if not edge_labels:
         return graph
@@ -153,7 +165,7 @@ def create_small_graph_from_matrix(matrix_data, scale=0.3, directed=False, edge_
     # Create vertices as small labeled dots
     vertices = {}
     for i in range(num_nodes):
-        label = MathTex(str(i), color=BLACK).scale(0.4)
+        label = numeric_label(i, color=BLACK).scale(0.4)
         dot = LabeledDot(label, radius=0.2, fill_color=WHITE, fill_opacity=1)
         dot.move_to(positions[i])
         vertices[i] = dot
@@ -176,6 +188,7 @@ def create_small_graph_from_matrix(matrix_data, scale=0.3, directed=False, edge_
     # Create edges
     edges = VGroup()
     weight_labels = VGroup()
+    edge_dict = {}  # Map (i,j) (and (j,i) if undirected) to edge mobject
 
     for i, j, weight in edges_data:
         start = positions[i]
@@ -199,7 +212,9 @@ def create_small_graph_from_matrix(matrix_data, scale=0.3, directed=False, edge_
                 tip_length=0.08,
                 max_tip_length_to_length_ratio=0.15
             )
+            edge_dict[(j, i)] = arrow
         edges.add(arrow)
+        edge_dict[(i, j)] = arrow
 
         if show_weights and weight != 1:
             mid = (start + end) / 2
@@ -213,6 +228,7 @@ def create_small_graph_from_matrix(matrix_data, scale=0.3, directed=False, edge_
     # Combine into graph group
     graph = VGroup(edges, *vertices.values(), weight_labels)
     graph.vertices = vertices
+    graph.edge_dict = edge_dict
 
     return graph.scale(scale)
 
@@ -241,7 +257,7 @@ def create_square_digraph(matrix_data, color, show_weights=False):
     # Create vertices
     vertices = {}
     for i in range(n):
-        label = MathTex(str(i), color=BLACK).scale(0.5)
+        label = numeric_label(i, color=BLACK).scale(0.5)
         dot = LabeledDot(label, radius=0.2, fill_color=WHITE, fill_opacity=1)
         dot.move_to(positions[i])
         vertices[i] = dot
@@ -249,6 +265,7 @@ def create_square_digraph(matrix_data, color, show_weights=False):
     # Create edges
     edges = VGroup()
     edge_labels = VGroup()
+    edge_dict = {}
     for i in range(n):
         for j in range(n):
             if matrix_data[i][j] != 0:
@@ -258,6 +275,7 @@ def create_square_digraph(matrix_data, color, show_weights=False):
                     tip_length=0.15, max_tip_length_to_length_ratio=0.25
                 )
                 edges.add(arrow)
+                edge_dict[(i, j)] = arrow
 
                 if show_weights:
                     weight = matrix_data[i][j]
@@ -273,6 +291,7 @@ def create_square_digraph(matrix_data, color, show_weights=False):
     graph = VGroup(edges, edge_labels, *vertices.values())
     graph.vertices = vertices
     graph.edges = edges
+    graph.edge_dict = edge_dict
     graph.edge_labels = edge_labels
     graph.positions = positions
     return graph
@@ -309,13 +328,14 @@ def create_multigraph_visual(nodes, edges, scale=0.8, node_radius=0.3):
     # Create vertices
     vertices = {}
     for i, pos in positions.items():
-        label = MathTex(str(i), color=BLACK).scale(0.6)
+        label = numeric_label(i, color=BLACK).scale(0.6)
         dot = LabeledDot(label, radius=node_radius, fill_color=WHITE, fill_opacity=1)
         dot.move_to(pos)
         vertices[i] = dot
 
     # Create edges with curves for parallel edges
     edge_mobjects = VGroup()
+    edge_dict = {}  # (src, tgt) to the first of its parallel edges
     for src, tgt in edges:
         key = (min(src, tgt), max(src, tgt))
         total = edge_counts[key]
@@ -350,10 +370,12 @@ def create_multigraph_visual(nodes, edges, scale=0.8, node_radius=0.3):
             edge.shift(edge.get_start() - start)
 
         edge_mobjects.add(edge)
+        edge_dict.setdefault((src, tgt), edge)
 
     graph = VGroup(edge_mobjects, *vertices.values())
     graph.vertices = vertices
     graph.edges = edge_mobjects
+    graph.edge_dict = edge_dict
 
     return graph.scale(scale)
 
@@ -467,7 +489,7 @@ def create_bipartite_graph(left_nodes, right_nodes, edges, scale=0.8, left_color
     # Left nodes
     for i, lbl in enumerate(left_labels):
         y = (n_left - 1) / 2 * spacing - i * spacing
-        label = MathTex(str(lbl), color=BLACK).scale(0.5)
+        label = numeric_label(lbl, color=BLACK).scale(0.5)
         dot = LabeledDot(label, radius=0.25, fill_color=left_color, fill_opacity=0.8)
         dot.move_to(np.array([left_x, y, 0]))
         vertices[f'L{i}'] = dot
@@ -475,22 +497,27 @@ def create_bipartite_graph(left_nodes, right_nodes, edges, scale=0.8, left_color
     # Right nodes
     for i, lbl in enumerate(right_labels):
         y = (n_right - 1) / 2 * spacing - i * spacing
-        label = MathTex(str(lbl), color=BLACK).scale(0.5)
+        label = numeric_label(lbl, color=BLACK).scale(0.5)
         dot = LabeledDot(label, radius=0.25, fill_color=right_color, fill_opacity=0.8)
         dot.move_to(np.array([right_x, y, 0]))
         vertices[f'R{i}'] = dot
 
     # Create edges
     edge_mobjects = VGroup()
+    edge_dict = {}  # Map (li, ri) and the vertex keys in both orders to edge mobject
     for li, ri in edges:
         start = vertices[f'L{li}'].get_center()
         end = vertices[f'R{ri}'].get_center()
         edge = Line(start, end, color=GRAY, stroke_width=2)
         edge_mobjects.add(edge)
+        edge_dict[(li, ri)] = edge
+        edge_dict[(f'L{li}', f'R{ri}')] = edge
+        edge_dict[(f'R{ri}', f'L{li}')] = edge
 
     graph = VGroup(edge_mobjects, *vertices.values())
     graph.vertices = vertices
     graph.edges = edge_mobjects
+    graph.edge_dict = edge_dict
 
     return graph.scale(scale)
 
@@ -503,6 +530,7 @@ def create_undirected_graph(matrix_data, layout="triangle", scale=1, edge_color=
     Args:
         matrix_data: 2D list representing a symmetric adjacency matrix
         layout: Layout algorithm for graph positioning (default: "triangle")
+                "force" uses a cached force-directed layout; anything else is circular
         scale: Scale factor for the graph (default: 1)
         edge_color: Color for the edges (default: BLUE)
         edge_labels: If True, return (graph, labels_group) with edge weight labels
@@ -523,6 +551,10 @@ def create_undirected_graph(matrix_data, layout="triangle", scale=1, edge_color=
             4: np.array([1.5, 0, 0]),          # Middle right
             5: np.array([0, sqrt3, 0])         # Top point
         }
+    elif layout == "force":
+        positions = cached_layout(list(range(num_rows)), [
+            (i, j) for i in range(num_rows) for j in range(i + 1, num_rows) if matrix_data[i][j] != 0
+        ])
     else:
         # Default circular layout
         positions = {
@@ -540,7 +572,7 @@ def create_undirected_graph(matrix_data, layout="triangle", scale=1, edge_color=
     # Create vertices as labeled dots
     vertices = {}
     for i in range(num_rows):
-        label = MathTex(str(i), color=BLACK).scale(0.7)
+        label = numeric_label(i, color=BLACK).scale(0.7)
         dot = LabeledDot(label, radius=0.3, fill_color=WHITE, fill_opacity=1)
         dot.move_to(positions[i])
         vertices[i] = dot
@@ -600,29 +632,38 @@ def create_undirected_graph(matrix_data, layout="triangle", scale=1, edge_color=
 
 def get_edge_between_vertices(graph, i, j):
     """
-    Find the edge mobject connecting vertices i and j in an undirected graph.
+    Find the edge mobject connecting vertices i and j.
 
     Args:
-        graph: Graph created by create_undirected_graph
+        graph: Graph created by any of the builders in this module
         i, j: Vertex indices
 
     Returns:
-        The DoubleArrow edge mobject, or None if not found
+        The edge mobject, or None if not found. For graphs with batched
+        edges (see `EdgeBatch`), a new mobject drawing that one edge.
+    """
+    if isinstance(getattr(graph, 'edges_group', None), EdgeBatch):
+        index = graph.edge_dict.get((i, j))
+        return graph.edges_group.get_edges(index) if index is not None else None
+    return graph.edge_dict.get((i, j))
+
+
+def get_edges_between(graph, pairs):
     """
-    # Use direct lookup if edge_dict is available
-    if hasattr(graph, 'edge_dict'):
-        return graph.edge_dict.get((i, j))
+    Find the edges between many vertex pairs, with one lookup per pair.
 
-    # Fallback to position-based search for backwards compatibility
-    pos_i = graph.positions[i]
-    pos_j = graph.positions[j]
-    mid = (pos_i + pos_j) / 2
+    Args:
+        graph: Graph created by any of the builders in this module
+        pairs: Iterable of (i, j) vertex pairs
 
-    for edge in graph.edges_group:
-        edge_mid = edge.get_center()
-        if np.linalg.norm(edge_mid - mid) < 0.5:
-            return edge
-    return None
+    Returns:
+        List of edge mobjects for the pairs that are connected. For graphs
+        with batched edges, a list holding one mobject drawing all of them.
+    """
+    if isinstance(getattr(graph, 'edges_group', None), EdgeBatch):
+        indices = graph.edges_group.edge_indices(pairs)
+        return [graph.edges_group.get_edges(indices)] if indices else []
+    return [graph.edge_dict[pair] for pair in pairs if pair in graph.edge_dict]
 
 
 def highlight_triangle(graph, triangle, color=YELLOW, edge_width=6):
@@ -630,7 +671,7 @@ def highlight_triangle(graph, triangle, color=YELLOW, edge_width=6):
     Create highlight copies of edges forming a triangle.
 
     Args:
-        graph: Graph created by create_undirected_graph
+        graph: Graph created by any of the builders in this module
         triangle: Tuple of 3 vertex indices (i, j, k)
         color: Highlight color
         edge_width: Stroke width for highlighted edges
@@ -638,20 +679,61 @@ def highlight_triangle(graph, triangle, color=YELLOW, edge_width=6):
     Returns:
         VGroup of highlighted edge copies
     """
-    i, j, k = triangle
     highlights = VGroup()
 
-    for a, b in [(i, j), (j, k), (i, k)]:
-        edge = get_edge_between_vertices(graph, a, b)
-        if edge:
-            highlight = edge.copy()
-            highlight.set_color(color)
-            highlight.set_stroke(width=edge_width)
-            highlights.add(highlight)
+    for edge in get_edges_between(graph, triangle_edges(triangle)):
+        highlight = edge.copy()
+        highlight.set_color(color)
+        highlight.set_stroke(width=edge_width)
+        highlights.add(highlight)
 
     return highlights
 
 
+def triangle_edges(triangle):
+    """The three vertex pairs (i, j), (j, k), (i, k) of a triangle (i, j, k)."""
+    i, j, k = triangle
+    return [(i, j), (j, k), (i, k)]
+
+
+def path_edges(path):
+    """The consecutive vertex pairs along a path of vertices."""
+    return list(zip(path, path[1:]))
+
+
+def highlight_edge_sets(graph, edge_sets, colors=YELLOW, edge_width=6):
+    """
+    Build highlights for many sets of edges (triangles, paths, BFS levels) at once.
+
+    Each set is drawn as one VMobject holding all of its edges as subpaths,
+    so e.g. the 45 karate club triangles cost 45 mobjects instead of 135
+    edge copies, and the whole result is a single mobject to animate.
+
+    Args:
+        graph: Graph created by any of the builders in this module
+        edge_sets: List of edge sets, each a list of (i, j) vertex pairs
+                   (see `triangle_edges` and `path_edges`)
+        colors: One color for every set, or a list of colors cycled over the sets
+        edge_width: Stroke width of the highlights
+
+    Returns:
+        VGroup with one VMobject per set, in order: animate set n with
+        e.g. Create(highlights[n]), a range with highlights[a:b], or all
+        sets together with Create(highlights)
+    """
+    if not isinstance(colors, (list, tuple)):
+        colors = [colors]
+
+    highlights = VGroup()
+    for n, pairs in enumerate(edge_sets):
+        highlight = VMobject(stroke_color=colors[n % len(colors)], stroke_width=edge_width)
+        for edge in get_edges_between(graph, pairs):
+            # Only the edge's own path: arrow tips are separate submobjects
+            highlight.append_points(edge.points)
+        highlights.add(highlight)
+    return highlights
+
+
 def color_nodes_by_value(graph, values, low_color=WHITE, high_color=RED):
     """
     Color graph nodes based on numeric values using gradient interpolation.
@@ -683,6 +765,314 @@ def color_nodes_by_value(graph, values, low_color=WHITE, high_color=RED):
     return result
 
 
+# Set LAYOUT_CACHE_DIR to share computed layouts between checkouts or render hosts
+LAYOUT_CACHE_ENV = "LAYOUT_CACHE_DIR"
+DEFAULT_LAYOUT_CACHE_DIR = os.path.join("~", ".cache", "illustrated-graphblas", "layouts")
+# Bumped whenever force_layout changes, so stale cached layouts are not reused
+LAYOUT_VERSION = 2
+# Above this many vertices, repulsion is approximated on a grid
+EXACT_REPULSION_LIMIT = 1000
+
+
+def _inverse_square_weights(points, sources, k):
+    # k^2 / d^2 between every point and every source; a vertex is then
+    # pushed by sum(w * (p - s)) = p * sum(w) - w @ s
+    dx = points[:, 0, None] - sources[None, :, 0]
+    dy = points[:, 1, None] - sources[None, :, 1]
+    return k * k / np.maximum(dx * dx + dy * dy, 1e-9)
+
+
+def _exact_repulsion(pos, k):
+    weight = _inverse_square_weights(pos, pos, k)
+    np.fill_diagonal(weight, 0)
+    return pos * weight.sum(axis=1)[:, None] - weight @ pos
+
+
+def _grid_repulsion(pos, k):
+    # Barnes-Hut-style: each vertex is pushed exactly by the vertices in its
+    # own grid cell, and by every other cell as one mass at its centroid
+    n = len(pos)
+    # Cells are split at quantiles rather than evenly, so dense clusters do
+    # not end up in a few crowded cells
+    side = int(np.ceil(n ** 0.25))
+    cuts = np.linspace(0, 1, side + 1)[1:-1]
+    ix, iy = (np.searchsorted(np.quantile(pos[:, axis], cuts), pos[:, axis]) for axis in (0, 1))
+    cell = ix * side + iy
+
+    counts = np.bincount(cell, minlength=side * side)
+    occupied = np.flatnonzero(counts)
+    centroids = np.stack([
+        np.bincount(cell, weights=pos[:, axis], minlength=side * side)[occupied] for axis in (0, 1)
+    ], axis=1) / counts[occupied, None]
+
+    weight = _inverse_square_weights(pos, centroids, k) * counts[occupied][None, :]
+    weight[cell[:, None] == occupied[None, :]] = 0
+    disp = pos * weight.sum(axis=1)[:, None] - weight @ centroids
+
+    order = np.argsort(cell, kind="stable")
+    bounds = np.cumsum(counts)
+    for c in occupied:
+        members = order[bounds[c] - counts[c]:bounds[c]]
+        if len(members) > 1:
+            disp[members] += _exact_repulsion(pos[members], k)
+    return disp
+
+
+def force_layout(n, edges, iterations=200, seed=0):
+    """
+    Fruchterman-Reingold layout computed with NumPy.
+
+    Each iteration moves every vertex at once: attraction along edges is
+    accumulated with one scatter-add, and repulsion is computed between
+    all pairs for small graphs, or on a grid for large ones, so graphs of
+    thousands of vertices lay out in seconds.
+
+    Args:
+        n: Number of vertices, numbered 0 to n-1
+        edges: List of (u, v) index pairs; direction is ignored
+        iterations: Number of cooling steps
+        seed: Seed of the random initial placement
+
+    Returns:
+        (n, 2) array of positions, centred, with the largest coordinate 1
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, (n, 2))
+    if n < 2:
+        return np.zeros((n, 2))
+    edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    repulsion = _exact_repulsion if n <= EXACT_REPULSION_LIMIT else _grid_repulsion
+
+    # Ideal edge length for n vertices in a 2x2 square
+    k = np.sqrt(4.0 / n)
+    temperature = 0.2
+    for step in range(iterations):
+        disp = repulsion(pos, k)
+        delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+        pull = delta * (np.linalg.norm(delta, axis=1) / k)[:, None]
+        np.add.at(disp, edges[:, 0], -pull)
+        np.add.at(disp, edges[:, 1], pull)
+
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)
+        limit = temperature * (1 - step / iterations)
+        pos += disp * (np.minimum(length, limit) / length)[:, None]
+
+    pos -= pos.mean(axis=0)
+    return pos / max(np.abs(pos).max(), 1e-9)
+
+
+def get_layout_cache_dir():
+    """Return the layout cache directory, honouring LAYOUT_CACHE_DIR."""
+    return os.path.expanduser(os.environ.get(LAYOUT_CACHE_ENV) or DEFAULT_LAYOUT_CACHE_DIR)
+
+
+def canonical_edges(edges):
+    """Sorted undirected edges without self-loops or duplicates, as a layout sees them."""
+    return sorted({(min(u, v), max(u, v)) for u, v in edges if u != v})
+
+
+def layout_key(n, edges, iterations, seed):
+    """Hash identifying a layout: the vertex count, edge list and settings."""
+    payload = json.dumps([LAYOUT_VERSION, n, canonical_edges(edges), iterations, seed])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_layout(vertices, edges, scale=2, iterations=200, seed=0, cache_dir=None):
+    """
+    Force-directed positions for a graph, computed once and then read from disk.
+
+    Layouts are stored in the layout cache (see `get_layout_cache_dir`),
+    keyed by a hash of the edge list, so every later render of the same
+    graph, in any scene, reuses them.
+
+    Args:
+        vertices: List of vertex ids, in a fixed order
+        edges: List of (u, v) vertex id pairs
+        scale: Half-width of the square the layout fills
+        iterations: Number of force_layout iterations
+        seed: Seed of the initial placement
+        cache_dir: Cache directory. Defaults to the global one.
+
+    Returns:
+        Dict {vertex: np.array([x, y, 0])}, usable as a manim Graph layout
+    """
+    index = {v: i for i, v in enumerate(vertices)}
+    # The layout is computed from exactly the edges its key is made of
+    pairs = canonical_edges((index[u], index[v]) for u, v in edges)
+    key = layout_key(len(index), pairs, iterations, seed)
+    path = os.path.join(cache_dir or get_layout_cache_dir(), key[:2], f"{key}.json")
+
+    try:
+        with open(path) as f:
+            pos = np.array(json.load(f)["positions"]).reshape(-1, 2)
+    except (OSError, ValueError, KeyError):
+        pos = force_layout(len(index), pairs, iterations, seed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"vertices": len(index), "edges": len(pairs), "positions": pos.tolist()}, f)
+        os.replace(tmp, path)
+
+    return {v: np.array([x, y, 0.0]) * scale for v, (x, y) in zip(vertices, pos)}
+
+
+# Parameters of the four control points of a straight cubic Bezier segment
+LINE_BEZIER = np.array([0, 1 / 3, 2 / 3, 1])
+
+
+class EdgeBatch(VGroup):
+    """
+    All the edges of a graph drawn as one VMobject per edge style.
+
+    Endpoints live in a single (edges, 2, 3) NumPy array and are shortened
+    to the vertex boundary in one vectorised pass, so a graph with tens of
+    thousands of edges costs a handful of mobjects instead of one Line each.
+    Edges sharing a colour and width are drawn as subpaths of the same
+    VMobject; restyling a set of edges moves them between these buckets.
+
+    Because buckets change size, restyling is instant and cannot be
+    animated (``batch.animate.set_edge_style(...)`` would morph edges into
+    their neighbours). To animate a highlight, play Create or FadeIn on a
+    `get_edges` overlay, then call set_edge_style once it is in place.
+    """
+
+    def __init__(self, positions, edges, node_radius=0, color=BLUE, stroke_width=1.5, directed=False):
+        """
+        Args:
+            positions: Dict {vertex: point} or (vertices, 3) array of vertex positions
+            edges: List of (source, target) vertex pairs
+            node_radius: Distance to trim from each end, so edges meet vertex circles
+            color: Initial edge color
+            stroke_width: Initial edge stroke width
+            directed: If False, (u, v) and (v, u) look up the same edge
+        """
+        super().__init__()
+        self.edge_list = list(edges)
+        self.directed = directed
+        self.edge_dict = {}
+        for index, (u, v) in enumerate(self.edge_list):
+            self.edge_dict.setdefault((u, v), index)
+            if not directed:
+                self.edge_dict.setdefault((v, u), index)
+
+        self.segments = self.edge_segments(positions, node_radius)
+        self.node_radius = node_radius
+        # Kept apart from styles, which is emptied when there are no edges
+        self.default_style = (ManimColor(color), stroke_width)
+        self.styles = [self.default_style]
+        self.style_index = np.zeros(len(self.edge_list), dtype=np.int64)
+        self.bucket_members = []
+        self._rebuild()
+
+    def edge_segments(self, positions, node_radius):
+        """Shortened (edges, 2, 3) endpoint array for vertex `positions`."""
+        if isinstance(positions, dict):
+            starts = np.array([positions[u] for u, _ in self.edge_list], dtype=float).reshape(-1, 3)
+            ends = np.array([positions[v] for _, v in self.edge_list], dtype=float).reshape(-1, 3)
+        else:
+            positions = np.asarray(positions, dtype=float)
+            pairs = np.array(self.edge_list, dtype=np.int64).reshape(-1, 2)
+            starts, ends = positions[pairs[:, 0]], positions[pairs[:, 1]]
+        direction = ends - starts
+        length = np.linalg.norm(direction, axis=1, keepdims=True)
+        unit = np.divide(direction, length, out=np.zeros_like(direction), where=length > 0)
+        return np.stack([starts + unit * node_radius, ends - unit * node_radius], axis=1)
+
+    def _sync_segments(self):
+        # Read endpoints back from the buckets, which carry any shift, scale
+        # or rotation applied to the mobject since they were built
+        for members, bucket in zip(self.bucket_members, self.submobjects):
+            if len(members):
+                points = bucket.points.reshape(-1, 4, 3)
+                self.segments[members, 0] = points[:, 0]
+                self.segments[members, 1] = points[:, 3]
+
+    def _segment_points(self, indices):
+        a, b = self.segments[indices, 0], self.segments[indices, 1]
+        return (a[:, None, :] + (b - a)[:, None, :] * LINE_BEZIER[None, :, None]).reshape(-1, 3)
+
+    def _rebuild(self):
+        used = np.unique(self.style_index)
+        self.styles = [self.styles[s] for s in used]
+        self.style_index = np.searchsorted(used, self.style_index)
+        self.bucket_members = [np.flatnonzero(self.style_index == s) for s in range(len(self.styles))]
+        buckets = []
+        for (color, width), members in zip(self.styles, self.bucket_members):
+            bucket = VMobject(stroke_color=color, stroke_width=width)
+            bucket.set_points(self._segment_points(members))
+            buckets.append(bucket)
+        self.submobjects = buckets
+
+    def edge_index(self, u, v):
+        """Index of the edge between u and v, or None."""
+        return self.edge_dict.get((u, v))
+
+    def edge_indices(self, pairs):
+        """Indices of the edges between many (u, v) pairs, skipping absent ones."""
+        return [self.edge_dict[pair] for pair in pairs if pair in self.edge_dict]
+
+    def set_edge_style(self, indices, color=None, stroke_width=None):
+        """
+        Restyle a set of edges in place, instantly.
+
+        Do not use with ``.animate``: edges move between bucket mobjects of
+        different sizes, which manim cannot interpolate. Animate a
+        `get_edges` overlay instead.
+
+        Args:
+            indices: Edge index, list or array of indices, boolean mask, or slice
+            color: New color (unchanged if None)
+            stroke_width: New stroke width (unchanged if None)
+
+        Returns:
+            self
+        """
+        self._sync_segments()
+        selected = np.atleast_1d(np.arange(len(self.edge_list))[indices])
+        current = self.style_index[selected]
+        for style in np.unique(current):
+            old_color, old_width = self.styles[style]
+            new_style = (
+                ManimColor(color) if color is not None else old_color,
+                stroke_width if stroke_width is not None else old_width,
+            )
+            if new_style not in self.styles:
+                self.styles.append(new_style)
+            self.style_index[selected[current == style]] = self.styles.index(new_style)
+        self._rebuild()
+        return self
+
+    def get_edges(self, indices, color=None, stroke_width=None):
+        """
+        A new VMobject drawing a subset of the edges, e.g. to Create or
+        FadeIn a highlight over them.
+        """
+        self._sync_segments()
+        selected = np.atleast_1d(np.arange(len(self.edge_list))[indices])
+        first_color, first_width = (
+            self.styles[self.style_index[selected[0]]] if len(selected) else self.default_style
+        )
+        edges = VMobject(
+            stroke_color=color if color is not None else first_color,
+            stroke_width=stroke_width if stroke_width is not None else first_width,
+        )
+        edges.set_points(self._segment_points(selected))
+        return edges
+
+    def follow(self, vertices):
+        """
+        Re-route every edge to the current centres of `vertices` (a dict of
+        mobjects), in one pass. Use as an updater so edges track moving
+        vertices: ``batch.add_updater(lambda b: b.follow(graph.vertices))``.
+        """
+        centers = {key: vertex.get_center() for key, vertex in vertices.items()}
+        self.segments = self.edge_segments(centers, self.node_radius)
+        for members, bucket in zip(self.bucket_members, self.submobjects):
+            bucket.set_points(self._segment_points(members))
+        return self
+
+
 # Karate club graph adjacency data (Zachary 1977)
 # 34 nodes, 78 edges
 KARATE_EDGES = [
@@ -767,13 +1157,15 @@ KARATE_TRIANGLE_CENTRALITY = {
 }
 
 
-def create_karate_graph(scale=0.08, node_radius=0.2):
+def create_karate_graph(scale=0.08, node_radius=0.2, layout=None):
     """
     Create the 34-node Zachary karate club graph with spring layout.
 
     Args:
         scale: Scale factor for positions
         node_radius: Radius of node circles
+        layout: None for the pre-computed positions, or "force" for a
+                cached force-directed layout (see `cached_layout`)
 
     Returns:
         VGroup with vertices dict and edges_group
@@ -818,6 +1210,9 @@ def create_karate_graph(scale=0.08, node_radius=0.2):
         33: np.array([1.0, -0.5, 0]),
     }
 
+    if layout == "force":
+        positions = cached_layout(list(range(n_nodes)), KARATE_EDGES, scale=2.5)
+
     # Scale positions
     for k in positions:
         positions[k] = positions[k] * scale * 10
@@ -825,33 +1220,18 @@ def create_karate_graph(scale=0.08, node_radius=0.2):
     # Create vertices
     vertices = {}
     for i in range(n_nodes):
-        label = MathTex(str(i), color=BLACK).scale(0.35)
+        label = numeric_label(i, color=BLACK).scale(0.35)
         dot = LabeledDot(label, radius=node_radius, fill_color=WHITE, fill_opacity=1)
         dot.move_to(positions[i])
         vertices[i] = dot
 
-    # Create edges
-    edges_group = VGroup()
-    for src, tgt in KARATE_EDGES:
-        start = positions[src]
-        end = positions[tgt]
-        line = Line(start, end, color=BLUE, stroke_width=1.5)
-        # Shorten to avoid overlapping vertices
-        direction = end - start
-        length = np.linalg.norm(direction)
-        if length > 0:
-            unit = direction / length
-            line = Line(
-                start + unit * node_radius,
-                end - unit * node_radius,
-                color=BLUE,
-                stroke_width=1.5
-            )
-        edges_group.add(line)
+    # All edges in one batch, shortened to avoid overlapping vertices
+    edges_group = EdgeBatch(positions, KARATE_EDGES, node_radius=node_radius, color=BLUE, stroke_width=1.5)
 
     graph = VGroup(edges_group, *vertices.values())
     graph.vertices = vertices
     graph.edges_group = edges_group
+    graph.edge_dict = edges_group.edge_dict  # (i, j) -> index into edges_group
     graph.positions = positions
 
     return graph
@@ -0,0 +1,92 @@
+import re
+
+from manim import DEFAULT_FONT_SIZE, WHITE, MathTex, VGroup, config
+
+DIGITS = "0123456789"
+# Labels made only of these are composed from the atlas; anything else
+# (TeX commands, spaces, braces) is compiled as MathTex as before
+COMPOSABLE = re.compile(r"[0-9A-Za-z.+\-]+")
+
+
+class GlyphAtlas:
+    """
+    Glyphs of one TeX template, compiled once and copied into labels.
+
+    The ten digits are typeset together in a single MathTex, which gives
+    each digit's shape, its height above the shared baseline, and TeX's
+    fixed digit advance. Other characters are added on first use by
+    typesetting them after a "0", which anchors them to the same baseline.
+    Composing a label is then a matter of copying a few paths, instead of
+    compiling and parsing TeX per label.
+    """
+
+    def __init__(self, tex_template=None):
+        self.tex_template = tex_template or config["tex_template"]
+        reference = MathTex(*DIGITS, arg_separator="", tex_template=self.tex_template)
+        self.baseline = reference.get_bottom()[1]
+        self.digit_advance = (reference[-1].get_center()[0] - reference[0].get_center()[0]) / (len(DIGITS) - 1)
+        # char -> (glyph, x offset of its centre in its cell, y offset above baseline, advance)
+        self.glyphs = {
+            char: (part.copy(), self.digit_advance / 2, part.get_center()[1] - self.baseline, self.digit_advance)
+            for char, part in zip(DIGITS, reference)
+        }
+
+    def glyph(self, char):
+        if char not in self.glyphs:
+            pair = MathTex("0", char, arg_separator="", tex_template=self.tex_template)
+            anchor, part = pair[0], pair[1]
+            cell_left = anchor.get_right()[0]
+            self.glyphs[char] = (
+                part.copy(),
+                part.get_center()[0] - cell_left,
+                part.get_center()[1] - anchor.get_bottom()[1],
+                part.get_right()[0] - cell_left,
+            )
+        return self.glyphs[char]
+
+    def compose(self, text):
+        """Lay out copies of the glyphs of `text` along one baseline."""
+        parts = []
+        x = 0.0
+        for char in text:
+            glyph, dx, dy, advance = self.glyph(char)
+            parts.append(glyph.copy().move_to([x + dx, dy, 0]))
+            x += advance
+        return VGroup(*parts).move_to([0, 0, 0])
+
+
+_ATLASES = {}
+
+
+def get_glyph_atlas(tex_template=None):
+    """Return the GlyphAtlas of a TeX template, building it on first use."""
+    tex_template = tex_template or config["tex_template"]
+    if id(tex_template) not in _ATLASES:
+        _ATLASES[id(tex_template)] = GlyphAtlas(tex_template)
+    return _ATLASES[id(tex_template)]
+
+
+def numeric_label(value, color=WHITE, font_size=DEFAULT_FONT_SIZE, tex_template=None, **kwargs):
+    """
+    Build a label for a number (or short alphanumeric id) from cached glyphs.
+
+    Drop-in for ``MathTex(str(value), color=...)`` on vertex labels and
+    matrix entries: the result is typeset the same way but costs a few
+    path copies instead of a TeX compile and SVG parse. Text the atlas
+    cannot compose falls back to MathTex. Also usable as a Matrix
+    ``element_to_mobject``.
+
+    Args:
+        value: Number or string to show
+        color: Fill color of the label
+        font_size: Font size, as for MathTex
+
+    Returns:
+        VGroup with one submobject per character (or a MathTex)
+    """
+    text = str(value)
+    if not COMPOSABLE.fullmatch(text):
+        return MathTex(text, color=color, font_size=font_size, tex_template=tex_template, **kwargs)
+    label = get_glyph_atlas(tex_template).compose(text)
+    label.scale(font_size / DEFAULT_FONT_SIZE)
+    return label.set_color(color)
@@ -0,0 +1,191 @@
+import numpy as np
+from manim import (
+    DOWN,
+    MED_SMALL_BUFF,
+    ORIGIN,
+    RIGHT,
+    WHITE,
+    YELLOW,
+    Group,
+    ImageMobject,
+    PMobject,
+    Polygon,
+    VectorizedPoint,
+    VGroup,
+    color_to_rgb,
+    config,
+)
+from manim.utils.images import RESAMPLING_ALGORITHMS
+
+from .matrix_utils import SparseMatrixMobject, matrix_brackets, sparse_entries
+
+# Largest dimension drawn with one label per entry, then with one dot per
+# entry; anything larger is drawn as a density image
+TEXT_LIMIT = 16
+DOT_LIMIT = 512
+# Largest side of the density image, in pixels
+RASTER_RESOLUTION = 512
+# Row and column highlights are never thinner than this, however many rows
+MIN_BAND = 0.04
+
+
+def coo_arrays(data, shape=None):
+    """
+    Stored entries as NumPy arrays, read without a Python loop for
+    GraphBLAS and scipy input.
+
+    Returns:
+        Tuple of ((nrows, ncols), rows, cols, values)
+    """
+    if hasattr(data, "to_coo") and hasattr(data, "nrows"):
+        rows, cols, values = data.to_coo()
+        shape = (data.nrows, data.ncols)
+    elif hasattr(data, "tocoo"):
+        coo = data.tocoo()
+        shape, rows, cols, values = tuple(coo.shape), coo.row, coo.col, coo.data
+    else:
+        shape, entries = sparse_entries(data, shape)
+        rows = [i for i, _, _ in entries]
+        cols = [j for _, j, _ in entries]
+        values = [value for _, _, value in entries]
+    # GraphBLAS indices are unsigned, which NumPy would promote to float in arithmetic
+    return shape, np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64), np.asarray(values)
+
+
+def lod_level(shape, text_limit=TEXT_LIMIT, dot_limit=DOT_LIMIT):
+    """Level of detail for a matrix shape: "text", "dots" or "raster"."""
+    size = max(shape)
+    if size <= text_limit:
+        return "text"
+    if size <= dot_limit:
+        return "dots"
+    return "raster"
+
+
+def density_image(shape, rows, cols, resolution=RASTER_RESOLUTION, color=WHITE):
+    """
+    RGBA pixels of a matrix's nonzero pattern, one pixel per block of cells.
+
+    Pixel opacity grows with the log of the number of entries in its block,
+    so both isolated entries and dense blocks remain visible.
+    """
+    nrows, ncols = shape
+    height, width = min(nrows, resolution), min(ncols, resolution)
+    counts = np.zeros((height, width))
+    np.add.at(counts, (rows * height // nrows, cols * width // ncols), 1)
+    density = np.log1p(counts) / np.log1p(max(counts.max(), 1))
+
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[..., :3] = (np.array(color_to_rgb(color)) * 255).astype(np.uint8)
+    pixels[..., 3] = (density * 255).astype(np.uint8)
+    return pixels
+
+
+class LODMatrixMobject(Group):
+    """
+    A matrix drawn at the level of detail its size allows.
+
+    Small matrices show each entry's value (a `SparseMatrixMobject`),
+    medium ones a dot per entry (one point cloud), and large ones such as
+    the SuiteSparse matrices in the gallery a density image of their
+    nonzero pattern, like a spy plot. All levels fit the same box, and
+    rows and columns can be highlighted the same way at every level.
+    """
+
+    def __init__(self, data, shape=None, width=4.0, height=None, level=None,
+                 text_limit=TEXT_LIMIT, dot_limit=DOT_LIMIT, resolution=RASTER_RESOLUTION,
+                 color=WHITE, bracket_buff=MED_SMALL_BUFF, **kwargs):
+        """
+        Args:
+            data: GraphBLAS Matrix, scipy.sparse matrix, dict of
+                {(row, col): value}, or 2D list (0 means absent)
+            shape: (nrows, ncols), for dict input
+            width: Width of the box the matrix is fitted into
+            height: Height of that box. Defaults to `width`.
+            level: Force "text", "dots" or "raster" instead of choosing by size
+            text_limit: Largest dimension drawn as text
+            dot_limit: Largest dimension drawn as dots
+            resolution: Largest side of the density image, in pixels
+            color: Color of entries, dots and density
+            bracket_buff: Gap between the cells and the brackets
+        """
+        super().__init__(**kwargs)
+        height = height or width
+        self.shape, rows, cols, values = coo_arrays(data, shape)
+        self.level = level or lod_level(self.shape, text_limit, dot_limit)
+        nrows, ncols = self.shape
+
+        if self.level == "text":
+            self.body = SparseMatrixMobject(data, shape=shape).set_color(color)
+            if self.body.width > width or self.body.height > height:
+                self.body.scale(min(width / self.body.width, height / self.body.height))
+            self.grid = self.body.grid
+            self.brackets = self.body.brackets
+            self.add(self.body)
+            return
+
+        cell = min(width / ncols, height / nrows)
+        self.grid = VGroup(VectorizedPoint(ORIGIN), VectorizedPoint(cell * RIGHT), VectorizedPoint(cell * DOWN))
+        if self.level == "dots":
+            points = np.column_stack([cols * cell, -rows * cell, np.zeros(len(rows))])
+            # Dots are sized in pixels, so size them to the cells at render resolution
+            thickness = max(1, round(cell * config.pixel_width / config.frame_width))
+            self.body = PMobject(stroke_width=thickness).add_points(points, color=color)
+        else:
+            self.body = ImageMobject(density_image(self.shape, rows, cols, resolution, color))
+            self.body.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+            self.body.stretch_to_fit_width(ncols * cell).stretch_to_fit_height(nrows * cell)
+            self.body.move_to([(ncols - 1) * cell / 2, -(nrows - 1) * cell / 2, 0])
+
+        self.brackets = matrix_brackets(
+            -cell / 2 - bracket_buff,
+            (ncols - 0.5) * cell + bracket_buff,
+            cell / 2 + bracket_buff,
+            -(nrows - 0.5) * cell - bracket_buff,
+            arm=min(0.15, width / 10),
+        ).set_color(color)
+        self.add(self.grid, self.body, self.brackets)
+        self.center()
+
+    def _grid_steps(self):
+        origin, right, down = (point.get_center() for point in self.grid)
+        return origin, right - origin, down - origin
+
+    def get_cell_center(self, i, j):
+        """Current position of cell (i, j)."""
+        origin, right, down = self._grid_steps()
+        return origin + j * right + i * down
+
+    def _band(self, first, last, is_row, color, opacity):
+        # Rectangle covering the cells from `first` to `last`, one cell
+        # (but at least MIN_BAND) thick
+        _, right, down = self._grid_steps()
+        along, side = (right, down) if is_row else (down, right)
+        side = side * max(1, MIN_BAND / max(np.linalg.norm(side), 1e-9)) / 2
+        start = self.get_cell_center(*first) - along / 2
+        end = self.get_cell_center(*last) + along / 2
+        return Polygon(
+            start - side, end - side, end + side, start + side,
+            color=color, fill_opacity=opacity, stroke_width=1,
+        )
+
+    def row_band(self, i, color=YELLOW, opacity=0.3):
+        """
+        Translucent rectangle over row i, to animate in with FadeIn or Create.
+
+        Move a highlight to another row with
+        ``Transform(band, matrix.row_band(k))``.
+        """
+        return self._band((i, 0), (i, self.shape[1] - 1), True, color, opacity)
+
+    def column_band(self, j, color=YELLOW, opacity=0.3):
+        """Translucent rectangle over column j, as for `row_band`."""
+        return self._band((0, j), (self.shape[0] - 1, j), False, color, opacity)
+
+    def highlight_rows(self, rows, color=YELLOW, opacity=0.3):
+        """VGroup of row bands, one per row index."""
+        return VGroup(*[self.row_band(i, color, opacity) for i in rows])
+
+    def highlight_columns(self, cols, color=YELLOW, opacity=0.3):
+        """VGroup of column bands, one per column index."""
+        return VGroup(*[self.column_band(j, color, opacity) for j in cols])
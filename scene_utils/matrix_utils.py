@@ -1,5 +1,7 @@
 from manim import *
 
+from .labels import numeric_label
+
 # The 6x6 sparse adjacency matrix used in Chapter0 Scene2 and Scene3
 CHAPTER0_MATRIX_DATA = [
     [0, 1, 0, 2, 0, 0],
@@ -39,9 +41,9 @@ def create_labeled_matrix(matrix_data, scale=1, v_buff=0.5, h_buff=0.5):
     num_rows = len(matrix_data)
     num_cols = len(matrix_data[0])
 
-    matrix = Matrix(matrix_data, v_buff=v_buff, h_buff=h_buff).scale(scale)
-    row_labels = [Tex(str(i)) for i in range(num_rows)]
-    col_labels = [Tex(str(j)) for j in range(num_cols)]
+    matrix = Matrix(matrix_data, v_buff=v_buff, h_buff=h_buff, element_to_mobject=numeric_label).scale(scale)
+    row_labels = [numeric_label(i) for i in range(num_rows)]
+    col_labels = [numeric_label(j) for j in range(num_cols)]
 
     for i, label in enumerate(row_labels):
         label.next_to(matrix.get_rows()[i], LEFT * 4)
@@ -125,7 +127,7 @@ def create_sparse_matrix(data, scale=0.6, v_buff=0.8, h_buff=1.0):
     Returns:
         Matrix with zero entries set to opacity 0
     """
-    matrix = Matrix(data, v_buff=v_buff, h_buff=h_buff).scale(scale)
+    matrix = Matrix(data, v_buff=v_buff, h_buff=h_buff, element_to_mobject=numeric_label).scale(scale)
 
     num_cols = len(data[0])
     for i, row in enumerate(data):
@@ -136,6 +138,172 @@ def create_sparse_matrix(data, scale=0.6, v_buff=0.8, h_buff=1.0):
     return matrix
 
 
+def sparse_entries(data, shape=None):
+    """
+    Read the stored entries of a matrix in any of the forms scenes use.
+
+    Args:
+        data: GraphBLAS Matrix, scipy.sparse matrix, dict of
+            {(row, col): value}, or 2D list (0 means absent)
+        shape: (nrows, ncols). Required for a dict unless its entries span
+            the matrix; ignored for the other forms.
+
+    Returns:
+        Tuple of ((nrows, ncols), list of (row, col, value) in row-major order)
+    """
+    if hasattr(data, "to_coo") and hasattr(data, "nrows"):
+        rows, cols, values = data.to_coo()
+        shape = (data.nrows, data.ncols)
+        entries = zip(rows.tolist(), cols.tolist(), values.tolist())
+    elif hasattr(data, "tocoo"):
+        coo = data.tocoo()
+        shape = coo.shape
+        entries = zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist())
+    elif isinstance(data, dict):
+        entries = [(i, j, value) for (i, j), value in data.items()]
+        shape = shape or (
+            max((i for i, _, _ in entries), default=-1) + 1,
+            max((j for _, j, _ in entries), default=-1) + 1,
+        )
+    else:
+        entries = get_non_zero_positions(data) if data else []
+        shape = (len(data), len(data[0]) if data else 0)
+    return tuple(shape), sorted(entries, key=lambda entry: entry[:2])
+
+
+def matrix_brackets(left, right, top, bottom, arm=0.15):
+    """Square brackets drawn as lines, with their spines at x=left and x=right."""
+    return VGroup(
+        VMobject().set_points_as_corners([
+            [left + arm, top, 0], [left, top, 0], [left, bottom, 0], [left + arm, bottom, 0],
+        ]),
+        VMobject().set_points_as_corners([
+            [right - arm, top, 0], [right, top, 0], [right, bottom, 0], [right - arm, bottom, 0],
+        ]),
+    )
+
+
+class SparseMatrixMobject(VGroup):
+    """
+    A matrix that only creates mobjects for its stored entries.
+
+    Unlike ``Matrix``, which builds (and ``create_sparse_matrix`` then hides)
+    a mobject for every position, entries are placed directly on a grid
+    computed from the shape, and the brackets are drawn as lines instead
+    of compiled TeX. Cost therefore grows with the number of stored entries
+    rather than rows times columns.
+
+    Three invisible points track the grid through later moves, scales and
+    rotations, so cell positions (and empty rows or columns) can still be
+    located after the matrix has been placed in a scene.
+    """
+
+    def __init__(self, data, shape=None, v_buff=0.8, h_buff=1.0,
+                 bracket_h_buff=MED_SMALL_BUFF, bracket_v_buff=MED_SMALL_BUFF,
+                 bracket_width=0.15, element_to_mobject=numeric_label, **kwargs):
+        """
+        Args:
+            data: Matrix in any form `sparse_entries` accepts
+            shape: (nrows, ncols), for dict input
+            v_buff: Vertical distance between row centres
+            h_buff: Horizontal distance between column centres
+            bracket_h_buff: Gap between the outer columns and the brackets
+            bracket_v_buff: How far the brackets extend past the outer rows
+            bracket_width: Length of the brackets' top and bottom arms
+            element_to_mobject: Builds the mobject of one stored value
+        """
+        super().__init__(**kwargs)
+        self.shape, stored = sparse_entries(data, shape)
+        self.v_buff = v_buff
+        self.h_buff = h_buff
+
+        self.grid = VGroup(VectorizedPoint(ORIGIN), VectorizedPoint(h_buff * RIGHT), VectorizedPoint(v_buff * DOWN))
+        self.entries = VGroup()
+        self.entry_map = {}
+        for i, j, value in stored:
+            entry = element_to_mobject(value).move_to(i * v_buff * DOWN + j * h_buff * RIGHT)
+            self.entries.add(entry)
+            self.entry_map[(i, j)] = entry
+
+        # Size of one cell, from the largest entry (or a digit's size when empty)
+        self.cell_width = max((entry.width for entry in self.entries), default=0.25)
+        self.cell_height = max((entry.height for entry in self.entries), default=0.35)
+
+        nrows, ncols = self.shape
+        top = self.cell_height / 2 + bracket_v_buff
+        bottom = -max(nrows - 1, 0) * v_buff - self.cell_height / 2 - bracket_v_buff
+        left = -self.cell_width / 2 - bracket_h_buff
+        right = max(ncols - 1, 0) * h_buff + self.cell_width / 2 + bracket_h_buff
+        self.brackets = matrix_brackets(left, right, top, bottom, bracket_width)
+
+        self.add(self.grid, self.entries, self.brackets)
+        self.center()
+
+    def _grid_vectors(self):
+        origin, right, down = (point.get_center() for point in self.grid)
+        return origin, right - origin, down - origin
+
+    def get_cell_center(self, i, j):
+        """Current position of cell (i, j), whether or not it stores an entry."""
+        origin, right, down = self._grid_vectors()
+        return origin + j * right + i * down
+
+    def _span(self, first, last, entries):
+        # Two invisible corner points give the group the extent of the full
+        # row or column, so next_to and SurroundingRectangle match Matrix
+        _, right, down = self._grid_vectors()
+        half_cell = right * self.cell_width / (2 * self.h_buff) + down * self.cell_height / (2 * self.v_buff)
+        return VGroup(
+            *entries,
+            VectorizedPoint(self.get_cell_center(*first) - half_cell),
+            VectorizedPoint(self.get_cell_center(*last) + half_cell),
+        )
+
+    def get_entry(self, i, j):
+        """Mobject of the entry stored at (i, j), or None."""
+        return self.entry_map.get((i, j))
+
+    def get_entries(self):
+        """Stored entries in row-major order."""
+        return self.entries
+
+    def get_rows(self):
+        """
+        One VGroup per row: its stored entries, followed by two invisible
+        points spanning the whole row (so empty rows can still be located).
+        """
+        nrows, ncols = self.shape
+        return VGroup(*[
+            self._span((i, 0), (i, ncols - 1), [self.entry_map[(i, j)] for j in range(ncols) if (i, j) in self.entry_map])
+            for i in range(nrows)
+        ])
+
+    def get_columns(self):
+        """One VGroup per column, laid out as in `get_rows`."""
+        nrows, ncols = self.shape
+        return VGroup(*[
+            self._span((0, j), (nrows - 1, j), [self.entry_map[(i, j)] for i in range(nrows) if (i, j) in self.entry_map])
+            for j in range(ncols)
+        ])
+
+    def get_brackets(self):
+        return self.brackets
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape, **kwargs):
+        """Build from coordinate arrays."""
+        return cls(dict(zip(zip(rows, cols), values)), shape=shape, **kwargs)
+
+    @classmethod
+    def from_csr(cls, indptr, indices, values, shape, **kwargs):
+        """Build from compressed sparse row arrays."""
+        data = {
+            (i, indices[k]): values[k]
+            for i in range(len(indptr) - 1) for k in range(indptr[i], indptr[i + 1])
+        }
+        return cls(data, shape=shape, **kwargs)
+
+
 # Chapter 5 example: 3 nodes, 4 directed edges
 # e0: 0→1, e1: 1→2, e2: 0→2, e3: 2→0
 CHAPTER5_EDGES = [(0, 1), (1, 2), (0, 2), (2, 0)]
@@ -224,6 +392,28 @@ CHAPTER9_Y_DATA = [
 # Bipartite graph edges for Scene1 (4 inputs → 3 outputs, sparse)
 CHAPTER9_BIPARTITE_EDGES = [(0, 0), (0, 2), (1, 1), (2, 0), (2, 2), (3, 1)]
 
+# Largest incidence matrix dimension drawn with create_sparse_matrix, so its
+# TeX brackets match the other matrices in the scene; larger ones switch to
+# SparseMatrixMobject
+INCIDENCE_MATRIX_LIMIT = 16
+
+
+def _incidence_matrix(data, scale):
+    """
+    Draw one incidence matrix, choosing the mobject by size.
+
+    Args:
+        data: 2D list of 0/1 incidence values
+        scale: Matrix scale factor
+
+    Returns:
+        Matrix from create_sparse_matrix, or a SparseMatrixMobject when either
+        dimension exceeds INCIDENCE_MATRIX_LIMIT
+    """
+    if max(len(data), len(data[0])) <= INCIDENCE_MATRIX_LIMIT:
+        return create_sparse_matrix(data, scale=scale)
+    return SparseMatrixMobject(data).scale(scale)
+
 
 def create_incidence_matrices(edges, n_nodes=None, scale=0.55,
                                node_color=BLUE, edge_color=GREEN):
@@ -234,6 +424,9 @@ def create_incidence_matrices(edges, n_nodes=None, scale=0.55,
     - S (source): n×m matrix where S[i,e]=1 if node i is the source of edge e
     - D (destination): m×n matrix where D[e,j]=1 if node j is the destination of edge e
 
+    Both are drawn with create_sparse_matrix up to INCIDENCE_MATRIX_LIMIT rows
+    or columns and with SparseMatrixMobject beyond that.
+
     Args:
         edges: List of (source, destination) tuples, e.g. [(0,1), (1,2), (0,2)]
         n_nodes: Number of nodes (auto-detected from max node index + 1 if None)
@@ -262,7 +455,7 @@ def create_incidence_matrices(edges, n_nodes=None, scale=0.55,
         D_data[e_idx][dst] = 1
 
     # Create S matrix visualization
-    S_mat = create_sparse_matrix(S_data, scale=scale)
+    S_mat = _incidence_matrix(S_data, scale)
 
     S_row_labels = VGroup(*[
         Text(str(i), font_size=12, color=node_color).next_to(
@@ -285,7 +478,7 @@ def create_incidence_matrices(edges, n_nodes=None, scale=0.55,
     S_group.matrix = S_mat
 
     # Create D matrix visualization
-    D_mat = create_sparse_matrix(D_data, scale=scale)
+    D_mat = _incidence_matrix(D_data, scale)
 
     D_row_labels = VGroup(*[
         Text(f"e{i}", font_size=12, color=edge_color).next_to(
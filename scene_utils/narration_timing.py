@@ -0,0 +1,146 @@
+import json
+import os
+import re
+
+import numpy as np
+
+from .audio_post import postprocess_loudness, processed_clip
+from .offline_speech import DEFAULT_WORDS_PER_MINUTE
+from .tts_cache import TTSCache, normalize_narration
+
+# Fewer cached clips than this and the fit is not trusted
+MIN_CALIBRATION_SAMPLES = 20
+
+FEATURES = ("intercept", "words", "sentences", "commas")
+
+
+def narration_features(text):
+    """Feature vector of a narration: 1, word count, sentence ends, commas."""
+    spoken = normalize_narration(text)
+    return [
+        1.0,
+        float(len(spoken.split())),
+        float(len(re.findall(r"[.!?](?:\s|$)", spoken))),
+        float(spoken.count(",") + spoken.count(";") + spoken.count(":")),
+    ]
+
+
+def audio_duration(path):
+    """Length in seconds of an audio file."""
+    from mutagen import File as AudioFile
+    return AudioFile(path).info.length
+
+
+class NarrationModel:
+    """
+    Linear model of narration length, fitted on audio already in the TTS cache.
+
+    Seconds are estimated as a weighted sum of the word count, the number of
+    sentence ends and the number of commas (pauses), plus a constant for the
+    lead-in and tail every clip has. An uncalibrated model assumes
+    DEFAULT_WORDS_PER_MINUTE and no pauses.
+    """
+
+    def __init__(self, coefficients=None, samples=0, mean_error=None):
+        self.coefficients = coefficients or [0.0, 60 / DEFAULT_WORDS_PER_MINUTE, 0.0, 0.0]
+        self.samples = samples
+        self.mean_error = mean_error
+
+    @property
+    def is_calibrated(self):
+        return self.samples > 0
+
+    def estimate(self, text):
+        """Estimated seconds of audio for one voiceover text."""
+        seconds = float(np.dot(self.coefficients, narration_features(text)))
+        return max(seconds, 0.0)
+
+    @classmethod
+    def fit(cls, samples):
+        """
+        Fit the model by least squares.
+
+        Args:
+            samples: List of (text, seconds) pairs
+
+        Returns:
+            A calibrated NarrationModel, or the default one if there are
+            fewer than MIN_CALIBRATION_SAMPLES samples
+        """
+        if len(samples) < MIN_CALIBRATION_SAMPLES:
+            return cls()
+        x = np.array([narration_features(text) for text, _ in samples])
+        y = np.array([seconds for _, seconds in samples])
+        coefficients = np.linalg.lstsq(x, y, rcond=None)[0]
+        mean_error = float(np.mean(np.abs(x @ coefficients - y)))
+        return cls([float(c) for c in coefficients], len(samples), mean_error)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "features": FEATURES,
+                "coefficients": self.coefficients,
+                "samples": self.samples,
+                "mean_error": self.mean_error,
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved model, or return the default one if there is none."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        return cls(data["coefficients"], data["samples"], data["mean_error"])
+
+
+def narration_model_path(service, cache=None):
+    """Where the model for a speech service is kept, next to its cached audio."""
+    cache = cache or TTSCache()
+    return os.path.join(cache.root, "models", f"{service}.json")
+
+
+def calibrate_narration_model(service, cache=None):
+    """
+    Fit and save a NarrationModel on every cached clip of a speech service.
+
+    Clips are measured as scenes play them: trimmed and normalised (see
+    audio_post.py) unless TTS_POSTPROCESS=0.
+
+    Args:
+        service: Speech service name (e.g. "elevenlabs", "gtts")
+        cache: TTSCache to read. Defaults to the global one.
+
+    Returns:
+        The fitted NarrationModel
+    """
+    cache = cache or TTSCache()
+    loudness = postprocess_loudness()
+
+    def played(path):
+        return path if loudness is None else processed_clip(path, loudness, cache)[0]
+
+    samples = [
+        (info["text"], audio_duration(played(path)))
+        for info, path in cache.entries()
+        if info.get("service") == service
+    ]
+    model = NarrationModel.fit(samples)
+    if model.is_calibrated:
+        model.save(narration_model_path(service, cache))
+    return model
+
+
+def load_narration_model(service, cache=None):
+    """Return the saved model of a speech service, or the default one."""
+    if service == "offline":
+        words_per_minute = float(os.environ.get("OFFLINE_VOICE_WPM", DEFAULT_WORDS_PER_MINUTE))
+        return NarrationModel([0.0, 60 / words_per_minute, 0.0, 0.0])
+    return NarrationModel.load(narration_model_path(service, cache))
+
+
+def estimate_narration(texts, model):
+    """Estimated total seconds of a sequence of voiceover texts."""
+    return sum(model.estimate(text) for text in texts)
@@ -0,0 +1,110 @@
+import subprocess
+from pathlib import Path
+
+from manim_voiceover.services.base import SpeechService
+from manim_voiceover.tracker import AUDIO_OFFSET_RESOLUTION
+
+from .tts_cache import BOOKMARK_PATTERN
+
+DEFAULT_WORDS_PER_MINUTE = 150
+MIN_NARRATION_SECONDS = 0.5
+
+# One silent MPEG-1 Layer III frame (48 kHz mono, 32 kbps): a 4-byte header
+# followed by all-zero side info and main data. At this rate every frame is
+# exactly 96 bytes and 1152 samples, so the file length is the duration.
+SILENT_MP3_FRAME = bytes([0xFF, 0xFB, 0x14, 0xC4]) + bytes(92)
+SILENT_MP3_FRAME_SECONDS = 1152 / 48000
+
+
+def narration_duration(text, words_per_minute=DEFAULT_WORDS_PER_MINUTE):
+    """Seconds a narration takes at `words_per_minute`, ignoring bookmarks."""
+    words = len(BOOKMARK_PATTERN.sub("", text).split())
+    return max(MIN_NARRATION_SECONDS, words * 60 / words_per_minute)
+
+
+def write_silent_mp3(path, seconds):
+    """Write `seconds` of silence as an MP3 without needing an encoder."""
+    frames = max(1, round(seconds / SILENT_MP3_FRAME_SECONDS))
+    with open(path, "wb") as f:
+        f.write(SILENT_MP3_FRAME * frames)
+
+
+def write_tone_mp3(path, seconds, frequency):
+    """Write a quiet sine tone of `seconds` as an MP3 (needs ffmpeg)."""
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error",
+         "-f", "lavfi", "-i", f"sine=frequency={frequency}:sample_rate=48000:duration={seconds:.3f}",
+         "-af", "volume=0.1", "-ac", "1", "-b:a", "32k", str(path)],
+        check=True,
+    )
+
+
+def even_word_boundaries(text, seconds):
+    """Word boundaries spreading the words of `text` evenly over `seconds`."""
+    spoken = BOOKMARK_PATTERN.sub("", text)
+    words = []
+    offset = 0
+    for word in spoken.split():
+        offset = spoken.index(word, offset)
+        words.append((offset, word))
+        offset += len(word)
+    return [
+        {
+            "audio_offset": int(i * seconds / len(words) * AUDIO_OFFSET_RESOLUTION),
+            "text_offset": text_offset,
+            "word_length": len(word),
+            "text": word,
+            "boundary_type": "Word",
+        }
+        for i, (text_offset, word) in enumerate(words)
+    ]
+
+
+class OfflineService(SpeechService):
+    """
+    Speech service that needs no network: narration becomes silence (or a
+    tone) lasting as long as the text would take to read aloud.
+
+    The duration is the word count at `words_per_minute`, so the timing of
+    animations can be iterated on quickly and the output is the same on
+    every run. Words are spread evenly over the clip, so bookmarks work.
+    """
+
+    def __init__(self, words_per_minute=DEFAULT_WORDS_PER_MINUTE, tone=0, **kwargs):
+        """
+        Args:
+            words_per_minute: Speaking rate used to size each clip
+            tone: Frequency in Hz of a tone to play instead of silence, or 0
+        """
+        SpeechService.__init__(self, **kwargs)
+        self.words_per_minute = words_per_minute
+        self.tone = tone
+
+    def generate_from_text(self, text, cache_dir=None, path=None, **kwargs):
+        if cache_dir is None:
+            cache_dir = self.cache_dir
+
+        input_text = BOOKMARK_PATTERN.sub("", text)
+        input_data = {
+            "input_text": input_text,
+            "service": "offline",
+            "words_per_minute": self.words_per_minute,
+            "tone": self.tone,
+        }
+        cached_result = self.get_cached_result(input_data, Path(cache_dir))
+        if cached_result is not None:
+            return cached_result
+
+        audio_path = path or self.get_audio_basename(input_data) + ".mp3"
+        seconds = narration_duration(text, self.words_per_minute)
+        if self.tone:
+            write_tone_mp3(Path(cache_dir) / audio_path, seconds, self.tone)
+        else:
+            write_silent_mp3(Path(cache_dir) / audio_path, seconds)
+
+        return {
+            "input_text": text,
+            "input_data": input_data,
+            "original_audio": audio_path,
+            "word_boundaries": even_word_boundaries(text, seconds),
+        }
@@ -1,22 +1,63 @@
+import inspect
+import json
 import os
-from manim import Text, UP, RIGHT
+import time
+from pathlib import Path
 
+from manim import Text, UP, RIGHT, config
 
-def get_speech_service():
+from .audio_post import postprocess_loudness, use_audio_postprocess
+from .tts_cache import BOOKMARK_PATTERN, use_tts_cache
+
+
+def get_speech_service(cache_dir=None, voice_service=None):
     """
     Returns the appropriate speech service based on the VOICE_SERVICE environment variable.
 
-    - VOICE_SERVICE=elevenlabs: Uses ElevenLabs (paid, high quality)
+    - VOICE_SERVICE=elevenlabs: Uses ElevenLabs (paid, high quality), with
+      requests sent concurrently over pooled connections (see
+      elevenlabs_async.py)
     - VOICE_SERVICE=gtts or unset: Uses Google TTS (free, online)
+    - VOICE_SERVICE=offline: Silent clips sized by word count (no network).
+      OFFLINE_VOICE_WPM sets the speaking rate and OFFLINE_VOICE_TONE a tone
+      frequency in Hz to play instead of silence.
+
+    Synthesised audio goes through the global TTS cache (see tts_cache.py),
+    so a narration is only synthesised once per voice. Each clip is then
+    trimmed and loudness-normalised once (see audio_post.py) unless
+    TTS_POSTPROCESS=0; TTS_LOUDNESS sets the target in LUFS.
+
+    Args:
+        cache_dir: Local voiceover directory (a Path). Defaults to media/voiceovers.
+        voice_service: "elevenlabs", "gtts" or "offline". Defaults to VOICE_SERVICE.
     """
-    voice_service = os.environ.get('VOICE_SERVICE', 'gtts').lower()
+    voice_service = (voice_service or os.environ.get('VOICE_SERVICE', 'gtts')).lower()
+
+    def postprocess(service):
+        loudness = postprocess_loudness()
+        if loudness is None:
+            return service
+        return use_audio_postprocess(service, loudness)
 
     if voice_service == 'elevenlabs':
-        from manim_voiceover.services.elevenlabs import ElevenLabsService
-        return ElevenLabsService(voice_name="michelp", transcription_model=None)
+        from .elevenlabs_async import AsyncElevenLabsService
+        service = AsyncElevenLabsService(voice_name="michelp", cache_dir=cache_dir)
+        voice = f"{service.voice.name}/{service.voice_id}/{service.model}"
+        return postprocess(use_tts_cache(service, voice, "elevenlabs", input_data=service.input_data))
+    elif voice_service == 'offline':
+        from .offline_speech import DEFAULT_WORDS_PER_MINUTE, OfflineService
+        return OfflineService(
+            words_per_minute=float(os.environ.get('OFFLINE_VOICE_WPM', DEFAULT_WORDS_PER_MINUTE)),
+            tone=float(os.environ.get('OFFLINE_VOICE_TONE', 0)),
+            cache_dir=cache_dir,
+        )
     else:
         from manim_voiceover.services.gtts import GTTSService
-        return GTTSService()
+        service = GTTSService(cache_dir=cache_dir)
+        return postprocess(use_tts_cache(
+            service, f"{service.lang}/{service.tld}", "gtts",
+            input_data=lambda text: {"input_text": BOOKMARK_PATTERN.sub("", text), "service": "gtts"},
+        ))
 
 
 def is_prod_mode():
@@ -31,6 +72,76 @@ def get_scene_indicator():
     return f"{chapter_num}/{scene_num}"
 
 
+def record_speech_timing(service, path):
+    """
+    Wrap a speech service so the time spent producing narration is recorded.
+
+    After every voiceover the call count and cumulative seconds are written
+    to `path` as JSON, which the build timing report picks up.
+
+    Args:
+        service: A manim-voiceover SpeechService
+        path: JSON file to write the totals to
+
+    Returns:
+        The same service, with generate_from_text wrapped
+    """
+    totals = {"calls": 0, "seconds": 0.0}
+    generate = service.generate_from_text
+
+    def write_totals():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(totals, f)
+
+    def timed_generate(*args, **kwargs):
+        start = time.monotonic()
+        try:
+            return generate(*args, **kwargs)
+        finally:
+            totals["calls"] += 1
+            totals["seconds"] += time.monotonic() - start
+            write_totals()
+
+    write_totals()
+    service.generate_from_text = timed_generate
+    return service
+
+
+def record_sound_cues(scene, path):
+    """
+    Record a scene's sounds in a cue sheet instead of mixing them in manim.
+
+    Every add_sound call (including each voiceover) is written to `path` as
+    a {"path", "time", "gain"} cue, and manim renders a silent video. The
+    build then mixes the whole soundtrack in one pass and muxes it once (see
+    build_utils.audio_mix).
+
+    Args:
+        scene: The VoiceoverScene instance
+        path: JSON file to write the cues to
+    """
+    cues = []
+
+    def write_cues():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"cues": cues}, f)
+
+    def add_cue(sound_file, time_offset=0, gain=None, **kwargs):
+        if scene.renderer.skip_animations:
+            return
+        cues.append({
+            "path": os.path.abspath(sound_file),
+            "time": scene.renderer.time + time_offset,
+            "gain": gain or 0,
+        })
+        write_cues()
+
+    write_cues()
+    scene.add_sound = add_cue
+
+
 def setup_scene(scene):
     """
     Set up a scene with the appropriate speech service and dev indicator.
@@ -43,8 +154,24 @@ def setup_scene(scene):
     Args:
         scene: The VoiceoverScene instance
     """
-    # Set up speech service
-    scene.set_speech_service(get_speech_service())
+    # Scenes of a chapter may render at once (invoke build-chapter --jobs N),
+    # so each keeps its own voiceover cache.json and text cache; both are
+    # updated without locking. Clips are shared through the global TTS cache.
+    scene_name = f"Scene{os.environ.get('SCENE_NUM', '0')}"
+    config.text_dir = os.path.join(config.text_dir, scene_name)
+
+    # Set up speech service, recording synthesis time for the build report
+    telemetry_path = os.path.join("media", "telemetry", f"{scene_name}.json")
+    service = get_speech_service(cache_dir=Path("media", "voiceovers", scene_name))
+    scene.set_speech_service(record_speech_timing(service, telemetry_path))
+    if os.environ.get('PRECOMPOSE_AUDIO', '') == '1':
+        record_sound_cues(scene, os.path.join("media", "audio", f"{scene_name}.cues.json"))
+
+    # Services that can synthesise concurrently start on every voiceover now
+    if hasattr(service, "pipeline"):
+        from build_utils import voiceover_texts
+        texts, _ = voiceover_texts(inspect.getsourcefile(type(scene)))
+        service.pipeline(texts)
 
     # Add dev indicator if not in production mode
     if not is_prod_mode():
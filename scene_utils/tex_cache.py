@@ -0,0 +1,73 @@
+import fcntl
+import os
+import traceback
+from pathlib import Path
+
+from manim import config
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import tex_hash
+
+# Set TEX_CACHE_DIR to share compiled TeX between checkouts or render hosts
+TEX_CACHE_ENV = "TEX_CACHE_DIR"
+DEFAULT_TEX_CACHE_DIR = os.path.join("~", ".cache", "illustrated-graphblas", "tex")
+# Renders started by invoke set GLOBAL_TEX_CACHE=1 to compile into the shared cache
+GLOBAL_TEX_CACHE_ENV = "GLOBAL_TEX_CACHE"
+
+
+def get_tex_cache_dir():
+    """Return the global Tex cache directory, honouring TEX_CACHE_DIR."""
+    return os.path.expanduser(os.environ.get(TEX_CACHE_ENV) or DEFAULT_TEX_CACHE_DIR)
+
+
+def use_global_tex_cache(tex_dir=None):
+    """
+    Compile TeX into one cache shared by every chapter instead of media/Tex.
+
+    manim already names each compiled file by a hash of the complete TeX
+    source (expression, environment and template), so pointing tex_dir at
+    a shared directory is enough to reuse a compile across chapters. Since
+    several renders may now compile into the same directory at once, each
+    expression is compiled under its own file lock, and manim's cleanup of
+    intermediate files (which would delete other processes' work in
+    progress) is turned off.
+    """
+    tex_dir = tex_dir or get_tex_cache_dir()
+    os.makedirs(tex_dir, exist_ok=True)
+    config.tex_dir = tex_dir
+    config.no_latex_cleanup = True
+
+    compile_svg = getattr(tex_mobject.tex_to_svg_file, "unlocked", tex_mobject.tex_to_svg_file)
+
+    def locked_tex_to_svg_file(expression, environment=None, tex_template=None):
+        template = tex_template or config["tex_template"]
+        if environment is not None:
+            code = template.get_texcode_for_expression_in_env(expression, environment)
+        else:
+            code = template.get_texcode_for_expression(expression)
+        lock_path = Path(config.get_dir("tex_dir")) / f"{tex_hash(code)}.lock"
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return compile_svg(expression, environment=environment, tex_template=tex_template)
+
+    locked_tex_to_svg_file.unlocked = compile_svg
+    tex_mobject.tex_to_svg_file = locked_tex_to_svg_file
+
+
+def compile_tex_calls(calls):
+    """
+    Build Tex mobjects so their TeX is compiled into the shared cache.
+
+    Args:
+        calls: List of (class name, args, kwargs), e.g. ("MathTex", ("x^2",), {})
+
+    Returns:
+        List of (call, error message) for calls that failed to compile
+    """
+    use_global_tex_cache()
+    failures = []
+    for name, args, kwargs in calls:
+        try:
+            getattr(tex_mobject, name)(*args, **kwargs)
+        except Exception:
+            failures.append(((name, args, kwargs), traceback.format_exc(limit=1).strip().splitlines()[-1]))
+    return failures
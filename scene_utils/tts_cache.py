@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# Set TTS_CACHE_DIR to share the cache between checkouts or render hosts
+TTS_CACHE_ENV = "TTS_CACHE_DIR"
+DEFAULT_TTS_CACHE_DIR = os.path.join("~", ".cache", "illustrated-graphblas", "tts")
+
+BOOKMARK_PATTERN = re.compile(r"<bookmark\s*mark\s*=['\"]\w*[\"']\s*/>")
+
+
+def get_tts_cache_dir():
+    """Return the global TTS cache directory, honouring TTS_CACHE_DIR."""
+    return os.path.expanduser(os.environ.get(TTS_CACHE_ENV) or DEFAULT_TTS_CACHE_DIR)
+
+
+def normalize_narration(text):
+    """
+    Reduce narration text to what is actually spoken.
+
+    Bookmarks are removed and whitespace collapsed, so reflowing a
+    voiceover string or moving a bookmark does not cause a new synthesis.
+    """
+    return " ".join(BOOKMARK_PATTERN.sub("", text).split())
+
+
+def narration_key(text, voice, service):
+    """
+    Content address of a synthesised narration clip.
+
+    Args:
+        text: Narration text (normalised before hashing)
+        voice: String identifying the voice and its settings
+        service: Speech service name (e.g. "elevenlabs", "gtts")
+
+    Returns:
+        Hex sha256 digest
+    """
+    payload = json.dumps(
+        {"text": normalize_narration(text), "voice": voice, "service": service},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _atomic_copy(src, dest):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest), suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class TTSCache:
+    """
+    Content-addressed store of synthesised narration shared by every chapter.
+
+    Clips live at ``<root>/<key[:2]>/<key><ext>`` with a ``<key>.json``
+    sidecar holding the text, voice and service they were made from. Writes
+    go through a temporary file and a rename, so several render hosts can
+    share one cache directory.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or get_tts_cache_dir()
+
+    def _base(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def lookup(self, key):
+        """Return the path of the cached clip for `key`, or None."""
+        try:
+            with open(self._base(key) + ".json") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        path = self._base(key) + entry["ext"]
+        return path if os.path.exists(path) else None
+
+    def entries(self):
+        """Yield (info dict, clip path) for every clip in the cache."""
+        for sidecar in sorted(Path(self.root).glob("*/*.json")):
+            if sidecar.parent.name in ("models", "processed"):
+                continue  # narration models and post-processed clips, not sidecars
+            try:
+                with open(sidecar) as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(info, dict) or "ext" not in info or "text" not in info:
+                continue
+            path = sidecar.with_suffix(info["ext"])
+            if path.exists():
+                yield info, str(path)
+
+    def store(self, key, audio_path, **info):
+        """Copy a freshly synthesised clip into the cache."""
+        ext = os.path.splitext(audio_path)[1]
+        _atomic_copy(audio_path, self._base(key) + ext)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self._base(key)), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(dict(info, ext=ext), f)
+        os.replace(tmp, self._base(key) + ".json")
+
+
+def use_tts_cache(service, voice, name, cache=None, input_data=None):
+    """
+    Route a speech service through the global content-addressed TTS cache.
+
+    A narration already in the cache is copied into the service's local
+    voiceover cache instead of being synthesised, so text that has been
+    paid for once is never sent to the service again, whichever chapter
+    or host asks for it and even after `invoke clean-all`.
+
+    Args:
+        service: A manim-voiceover SpeechService
+        voice: String identifying the voice and its settings
+        name: Speech service name used in the cache key
+        cache: TTSCache to use. Defaults to one at get_tts_cache_dir().
+        input_data: Function giving the service's own cache.json key for a
+            text, so clips taken from the global cache are recorded in the
+            local cache.json as if the service had made them
+
+    Returns:
+        The same service, with generate_from_text wrapped and a
+        seed_narration method added
+    """
+    cache = cache or TTSCache()
+    generate = service.generate_from_text
+    if input_data is None:
+        def input_data(text):
+            return {"input_text": normalize_narration(text), "service": name, "voice": voice}
+
+    def cached_generate(text, cache_dir=None, path=None, **kwargs):
+        local_dir = Path(cache_dir or service.cache_dir)
+        key = narration_key(text, voice, name)
+        cached = cache.lookup(key)
+        if cached is not None:
+            data = input_data(text)
+            audio_path = path or service.get_audio_basename(data) + os.path.splitext(cached)[1]
+            if not (local_dir / audio_path).exists():
+                _atomic_copy(cached, str(local_dir / audio_path))
+            return {
+                "input_text": text,
+                "input_data": data,
+                "original_audio": audio_path,
+            }
+
+        result = generate(text, cache_dir=cache_dir, path=path, **kwargs)
+        # A local cache hit may be a post-processed entry; only raw audio is cached
+        raw = result.get("raw_audio", result["original_audio"])
+        cache.store(key, str(local_dir / raw),
+                    text=normalize_narration(text), voice=voice, service=name)
+        return result
+
+    def seed_narration(voiceover_dir):
+        """
+        Store the clips in a local voiceover cache that this service and
+        voice made, and that the global cache does not have yet.
+
+        Returns:
+            Number of clips stored
+        """
+        try:
+            with open(Path(voiceover_dir) / "cache.json") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        seeded = 0
+        for entry in entries:
+            text = entry.get("input_text")
+            if text is None or entry.get("input_data") != input_data(text):
+                continue  # another service or voice
+            key = narration_key(text, voice, name)
+            # Post-processed entries keep the synthesised clip as raw_audio
+            audio = Path(voiceover_dir) / entry.get("raw_audio", entry["original_audio"])
+            if cache.lookup(key) is None and audio.exists():
+                cache.store(key, str(audio), text=normalize_narration(text), voice=voice, service=name)
+                seeded += 1
+        return seeded
+
+    service.generate_from_text = cached_generate
+    service.seed_narration = seed_narration
+    service.cached_narration = lambda text: cache.lookup(narration_key(text, voice, name))
+    return service
+
+
+def prefetch_narration(service, texts, jobs=4, retries=3, backoff=5, voiceover_dirs=()):
+    """
+    Synthesise narration into the TTS cache ahead of rendering.
+
+    Clips already in the chapters' local voiceover caches are first copied
+    into the TTS cache, so nothing rendered before the cache existed is
+    synthesised again. Texts that are not cached yet are synthesised on a pool of `jobs`
+    threads, which bounds the number of requests in flight. A failing
+    request is retried up to `retries` times, waiting `backoff` seconds
+    before the first retry and twice as long before each further one.
+
+    Args:
+        service: A speech service wrapped by use_tts_cache
+        texts: Narration strings; duplicates are synthesised once
+        voiceover_dirs: Local voiceover caches (media/voiceovers) to seed from
+
+    Returns:
+        Tuple of (number synthesised, number already cached, list of
+        (text, exception) for texts that still failed)
+    """
+    for voiceover_dir in voiceover_dirs:
+        service.seed_narration(voiceover_dir)
+    unique = {normalize_narration(text): text for text in texts}
+    missing = [text for text in unique.values() if service.cached_narration(text) is None]
+
+    def synthesise(text, cache_dir):
+        for attempt in range(retries + 1):
+            try:
+                return service.generate_from_text(text, cache_dir=cache_dir)
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(backoff * 2 ** attempt)
+
+    failures = []
+    # Clips only need to reach the global cache; scenes copy them out later
+    with tempfile.TemporaryDirectory() as staging, ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(synthesise, text, Path(staging)): text for text in missing}
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failures.append((futures[future], future.exception()))
+
+    return len(missing) - len(failures), len(unique) - len(missing), failures
@@ -2,63 +2,684 @@ import os
 import shutil
 import glob
 import re
-from invoke import task
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from invoke import task, Exit
 from time import sleep
 
-@task
-def build_scene(ctx, chapter, scene, quality='l', prod=False):
-    """Build a single scene. Use --prod for production build with ElevenLabs TTS."""
+from build_utils import (
+    FARM_DIR,
+    BuildJournal,
+    BuildManifest,
+    BuildReport,
+    StitchManifest,
+    chapter_metadata,
+    compose_scene_audio,
+    conform_command,
+    describe_signature,
+    git_reader,
+    hls_command,
+    image_variants_command,
+    JobQueue,
+    ladder_command,
+    master_playlist,
+    numeric_label_calls,
+    probe,
+    read_file,
+    reference_signature,
+    scene_digest,
+    scene_media_stats,
+    segment_times,
+    stream_signature,
+    tex_calls,
+    voiceover_texts,
+)
+
+RESOLUTIONS = dict(l='480p15', m='720p30', h='1080p60')
+# (width, height, fps) of each manim quality preset
+FRAME_SIZES = dict(l=(854, 480, 15), m=(1280, 720, 30), h=(1920, 1080, 60))
+# Exit code recorded for a farm job whose inputs differ on the worker
+DIGEST_MISMATCH = 97
+
+
+def chapter_dirs():
+    """Return the Chapter* directories in sorted order."""
+    return [
+        chapter for chapter in sorted(os.listdir())
+        if os.path.isdir(chapter) and chapter.startswith("Chapter")
+    ]
+
+
+def scene_names(chapter):
+    """Return the SceneN names of a chapter, sorted by scene number."""
+    scenes = [
+        filename.replace(".py", "") for filename in os.listdir(chapter)
+        if filename.startswith("Scene") and filename.endswith(".py")
+    ]
+    return sorted(scenes, key=lambda s: int(re.search(r'\d+', s).group()))
+
+
+def scene_env(chapter, scene, prod=False):
+    """
+    Return the environment variables a scene is rendered with.
+
+    Dev builds keep VOICE_SERVICE=offline (and its OFFLINE_VOICE_* settings)
+    from the caller's environment, as do all builds the TTS_POSTPROCESS,
+    TTS_LOUDNESS and PRECOMPOSE_AUDIO settings. GLOBAL_TEX_CACHE=1 points
+    the render at the shared Tex cache (see scene_utils/tex_cache.py).
+    """
     # Extract chapter and scene numbers
     chapter_match = re.search(r'Chapter(\d+)', chapter)
     scene_match = re.search(r'Scene(\d+)', scene)
-    chapter_num = chapter_match.group(1) if chapter_match else '0'
-    scene_num = scene_match.group(1) if scene_match else '0'
+    env = {
+        "CHAPTER_NUM": chapter_match.group(1) if chapter_match else '0',
+        "SCENE_NUM": scene_match.group(1) if scene_match else '0',
+        "GLOBAL_TEX_CACHE": "1",
+    }
+    if prod:
+        env["PROD_MODE"] = "1"
+        env["VOICE_SERVICE"] = "elevenlabs"
+    elif os.environ.get("VOICE_SERVICE") == "offline":
+        env["VOICE_SERVICE"] = "offline"
+        for name in ("OFFLINE_VOICE_WPM", "OFFLINE_VOICE_TONE"):
+            if name in os.environ:
+                env[name] = os.environ[name]
+    else:
+        env["VOICE_SERVICE"] = "gtts"
+    for name in ("TTS_POSTPROCESS", "TTS_LOUDNESS", "PRECOMPOSE_AUDIO"):
+        if name in os.environ:
+            env[name] = os.environ[name]
+    return env
+
+
+def scene_command(chapter, scene, quality='l', prod=False):
+    """Build the manim command line (with env prefix) for one scene."""
+    env_prefix = " ".join(f"{k}={v}" for k, v in scene_env(chapter, scene, prod).items())
+    return f"{env_prefix} manim -q{quality} {scene}.py"
+
+
+def scene_output(chapter, scene, quality='l'):
+    """Path of the mp4 manim writes for a scene."""
+    return os.path.join(chapter, "media", "videos", scene, RESOLUTIONS[quality], f"{scene}.mp4")
+
+
+def scene_inputs_digest(chapter, scene, quality='l', prod=False, read=read_file):
+    """Content hash of everything that determines a scene's output video."""
+    settings = dict(scene_env(chapter, scene, prod), quality=quality)
+    return scene_digest(chapter, scene, settings, read)
+
+
+def stale_scenes(scenes, quality='l', prod=False, manifest=None):
+    """Filter (chapter, scene) pairs down to those whose output is not current."""
+    manifest = manifest or BuildManifest()
+    stale = []
+    for chapter, scene in scenes:
+        digest = scene_inputs_digest(chapter, scene, quality, prod)
+        if manifest.is_current(chapter, scene, quality, digest, scene_output(chapter, scene, quality)):
+            print(f"{chapter}/{scene} is up to date, skipping")
+        else:
+            stale.append((chapter, scene))
+    return stale
+
+
+def record_scene(manifest, chapter, scene, quality='l', prod=False, digest=None):
+    """Record a freshly rendered scene in the build manifest."""
+    digest = digest or scene_inputs_digest(chapter, scene, quality, prod)
+    manifest.record(chapter, scene, quality, digest, scene_output(chapter, scene, quality))
+
+
+def prefetch_scenes(scenes, prod=False, jobs=4, retries=3, backoff=5):
+    """
+    Synthesise the narration of (chapter, scene) pairs into the TTS cache.
+
+    Runs before any manim process starts, so renders only read the cache.
+    Clips already in any chapter's media/voiceovers (or a scene's
+    directory under it) are reused, not synthesised again. Failures are reported but do not stop the build; those texts are
+    synthesised on demand by the scene instead.
+    """
+    # Imported here so tasks that never synthesise speech do not load manim
+    from scene_utils import get_speech_service, prefetch_narration
+
+    texts = []
+    dynamic = 0
+    for chapter, scene in scenes:
+        scene_texts, scene_dynamic = voiceover_texts(os.path.join(chapter, f"{scene}.py"))
+        texts += scene_texts
+        dynamic += len(scene_dynamic)
+
+    voice_service = scene_env("", "", prod)["VOICE_SERVICE"]
+    if voice_service == "offline":
+        return []  # clips are generated locally in no time
+    with tempfile.TemporaryDirectory() as scratch:
+        service = get_speech_service(cache_dir=Path(scratch), voice_service=voice_service)
+        start = time.monotonic()
+        # Scenes keep their own voiceover cache; older renders shared the chapter's
+        voiceover_dirs = [
+            path for chapter in chapter_dirs()
+            for path in [os.path.join(chapter, "media", "voiceovers")]
+            + sorted(glob.glob(os.path.join(chapter, "media", "voiceovers", "Scene*")))
+        ]
+        synthesised, cached, failures = prefetch_narration(service, texts, jobs, retries, backoff, voiceover_dirs)
+
+    print(f"Narration: {synthesised} synthesised, {cached} already cached "
+          f"in {time.monotonic() - start:.1f}s")
+    if dynamic:
+        print(f"  {dynamic} voiceover(s) with text computed at render time will be synthesised on demand")
+    for text, error in failures:
+        print(f"  failed after {retries} retries: {text[:60]!r} ({error})")
+    return failures
+
+
+def warm_tex_cache(jobs=None):
+    """
+    Compile every distinct Tex expression in the sources into the shared cache.
+
+    Expressions are extracted statically from the chapters and scene_utils,
+    plus the integer labels the graph and matrix helpers create at runtime,
+    and compiled on a pool of `jobs` processes (default: one per CPU).
+
+    Returns:
+        List of (call, error message) for expressions that failed to compile
+    """
+    # Imported here so tasks that never compile TeX do not load manim
+    from scene_utils import compile_tex_calls, get_tex_cache_dir
+
+    sources = glob.glob(os.path.join("Chapter*", "*.py")) + glob.glob(os.path.join("scene_utils", "*.py"))
+    unique = {}
+    dynamic = 0
+    for path in sorted(sources):
+        calls, path_dynamic = tex_calls(path)
+        dynamic += path_dynamic
+        for name, args, kwargs in calls + numeric_label_calls():
+            unique[(name, args, tuple(sorted(kwargs.items())))] = (name, args, kwargs)
+    calls = list(unique.values())
+
+    jobs = jobs or os.cpu_count()
+    batches = [calls[i::jobs * 4] for i in range(jobs * 4)]
+    start = time.monotonic()
+    failures = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for future in as_completed([pool.submit(compile_tex_calls, batch) for batch in batches if batch]):
+            failures += future.result()
+
+    print(f"Tex: {len(calls)} expression(s) ready in {get_tex_cache_dir()} "
+          f"after {time.monotonic() - start:.1f}s")
+    if dynamic:
+        print(f"  {dynamic} call(s) built from runtime values will be compiled when rendered")
+    for (name, args, _), error in failures:
+        print(f"  {name}{args} failed: {error}")
+    return failures
+
+
+def run_scene(chapter, scene, quality='l', prod=False, capture=True):
+    """
+    Render one scene as a manim subprocess and measure what it cost.
+
+    With `capture` the output goes to ``ChapterN/media/logs/SceneN.log``,
+    otherwise it is streamed to the terminal. CPU time and peak RSS come from
+    wait4(), so they include the latex, dvisvgm and ffmpeg children manim
+    spawns. With PRECOMPOSE_AUDIO=1 the scene's soundtrack is mixed from its
+    cue sheet and muxed into the video afterwards (see compose_scene_audio).
+
+    Returns:
+        Tuple of (returncode, stats dict, log path or None)
+    """
+    chapter_dir = os.path.abspath(chapter)
+    log_path = None
+    if capture:
+        log_dir = os.path.join(chapter_dir, "media", "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        log_path = os.path.join(log_dir, f"{scene}.log")
+
+    start = time.monotonic()
+    with open(log_path or os.devnull, "w") as log:
+        process = subprocess.Popen(
+            scene_command(chapter, scene, quality, prod), shell=True, cwd=chapter_dir,
+            stdout=log if capture else None, stderr=subprocess.STDOUT if capture else None,
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    stats = {
+        "cpu_seconds": usage.ru_utime + usage.ru_stime,
+        # ru_maxrss is in kilobytes on Linux but already in bytes on macOS
+        "max_rss_bytes": usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024,
+    }
+
+    # With PRECOMPOSE_AUDIO=1 manim rendered a silent video and a cue sheet
+    if process.returncode == 0 and scene_env(chapter, scene, prod).get("PRECOMPOSE_AUDIO") == "1":
+        mix_start = time.monotonic()
+        try:
+            compose_scene_audio(chapter, scene, scene_output(chapter, scene, quality))
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"{chapter}/{scene}: mixing the soundtrack failed: {e}")
+            process.returncode = 1
+        stats["audio_mix_seconds"] = time.monotonic() - mix_start
+
+    stats["wall_seconds"] = time.monotonic() - start
+    stats.update(scene_media_stats(chapter, scene, RESOLUTIONS[quality]))
+    return process.returncode, stats, log_path
+
+
+def run_scene_with_retries(chapter, scene, quality='l', prod=False, retries=0, backoff=30, journal=None,
+                           capture=True):
+    """
+    Render one scene, retrying failures with exponential backoff.
+
+    Transitions are written to `journal` when one is given.
+
+    Returns:
+        Tuple of (returncode, stats dict, log path) of the last attempt
+    """
+    for attempt in range(retries + 1):
+        if journal is not None:
+            journal.mark(chapter, scene, "running")
+        returncode, stats, log_path = run_scene(chapter, scene, quality, prod, capture)
+        if journal is not None:
+            journal.mark(chapter, scene, "done" if returncode == 0 else "failed", returncode=returncode)
+        if returncode == 0 or attempt == retries:
+            break
+        delay = backoff * 2 ** attempt
+        print(f"{chapter}/{scene} failed (exit {returncode}), retrying in {delay}s")
+        sleep(delay)
+    return returncode, stats, log_path
+
+
+def build_scenes(ctx, scenes, quality='l', prod=False, jobs=1, pause_time=0, on_chapter_done=None,
+                 journal=None, retries=0, backoff=30):
+    """
+    Build (chapter, scene) pairs, sequentially or on a pool of `jobs` workers.
+
+    With jobs=1 each scene is rendered in the foreground, pausing
+    `pause_time` seconds between scenes. With more, each scene runs in its
+    own manim subprocess with its output captured to
+    ``ChapterN/media/logs/SceneN.log``. A failing scene is retried up to
+    `retries` times and then recorded as failed; the remaining scenes are
+    still built. All of their narration is synthesised up front (see
+    `prefetch_scenes`).
+
+    When every scene of a chapter has finished, ``on_chapter_done(chapter,
+    failed)`` is called from the calling thread, so stitching never overlaps
+    a render of the same chapter. Successful renders are recorded in the
+    build manifest, and a timing report is written to .build/reports/.
+
+    Returns:
+        List of (chapter, scene, returncode, log_path) for failed scenes
+    """
+    manifest = BuildManifest()
+    report = BuildReport(quality, prod)
+    remaining = {}
+    for chapter, _ in scenes:
+        remaining[chapter] = remaining.get(chapter, 0) + 1
+    failed_chapters = set()
+    failures = []
+
+    # Hash inputs before rendering so an edit made mid-render is not masked
+    digests = {
+        (chapter, scene): scene_inputs_digest(chapter, scene, quality, prod)
+        for chapter, scene in scenes
+    }
+    if scenes:
+        prefetch_scenes(scenes, prod)
+
+    def finish(done, chapter, scene, returncode, stats, log_path):
+        status = "ok" if returncode == 0 else f"FAILED ({returncode})"
+        print(f"[{done}/{len(scenes)}] {chapter}/{scene} {status} in {stats['wall_seconds']:.1f}s")
+        report.add_scene(chapter, scene, returncode, stats)
+        if returncode != 0:
+            failures.append((chapter, scene, returncode, log_path))
+            failed_chapters.add(chapter)
+        else:
+            record_scene(manifest, chapter, scene, quality, prod, digests[(chapter, scene)])
+
+        remaining[chapter] -= 1
+        if remaining[chapter] == 0 and on_chapter_done is not None:
+            start = time.monotonic()
+            on_chapter_done(chapter, chapter in failed_chapters)
+            if chapter not in failed_chapters:
+                report.add_stitch(chapter, time.monotonic() - start)
+
+    if jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(
+                    run_scene_with_retries, chapter, scene, quality, prod, retries, backoff, journal,
+                ): (chapter, scene)
+                for chapter, scene in scenes
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                finish(done, *futures[future], *future.result())
+    else:
+        for done, (chapter, scene) in enumerate(scenes, start=1):
+            result = run_scene_with_retries(
+                chapter, scene, quality, prod, retries, backoff, journal, capture=False,
+            )
+            finish(done, chapter, scene, *result)
+            if done < len(scenes):
+                sleep(pause_time)
+
+    if scenes:
+        print(f"\nTiming report written to {report.write()}")
+    return failures
+
+
+def report_failures(failures):
+    """Print a summary of failed scenes and exit non-zero if there were any."""
+    if not failures:
+        return
+    print(f"\n{len(failures)} scene(s) failed:")
+    for chapter, scene, returncode, log_path in sorted(failures, key=lambda f: f[:2]):
+        where = f"see {log_path}" if log_path else "see output above"
+        print(f"  {chapter}/{scene} (exit {returncode}) - {where}")
+    raise Exit(code=1)
+
+@task
+def build_scene(ctx, chapter, scene, quality='l', prod=False):
+    """Build a single scene. Use --prod for production build with ElevenLabs TTS."""
+    report_failures(build_scenes(ctx, [(chapter, scene)], quality, prod))
+
+@task
+def build_chapter(ctx, chapter, quality='l', pause_time=3, prod=False, stitch=True, jobs=1, force=False, ladder=False):
+    """Build all scenes in a chapter and stitch the final video. Use --prod for production build with ElevenLabs TTS. Use --no-stitch to skip stitching. Use --jobs N to render N scenes in parallel. Use --force to rebuild scenes that are up to date. Use --ladder to render once at 1080p60 and derive 720p30 and 480p15."""
+    if ladder:
+        quality = 'h'
+    scenes = [(chapter, scene) for scene in scene_names(chapter)]
+    if not force:
+        scenes = stale_scenes(scenes, quality, prod)
+
+    def stitch_when_done(chapter, failed):
+        if stitch and not failed:
+            stitch_chapter(ctx, chapter, quality, ladder)
+
+    if not scenes:
+        stitch_when_done(chapter, False)
+        return
+    report_failures(build_scenes(ctx, scenes, quality, prod, jobs, pause_time, stitch_when_done))
+
+@task
+def build_all(ctx, quality="l", prod=False, jobs=1, force=False, resume=False, retries=2, backoff=30, pause_time=3,
+              ladder=False):
+    """Build all chapters. Use --prod for production build with ElevenLabs TTS. Use --jobs N to render N scenes in parallel across all chapters. Use --force to rebuild scenes that are up to date. Use --resume to continue an interrupted run from its journal. Use --ladder to render once at 1080p60 and derive 720p30 and 480p15."""
+    if ladder:
+        quality = 'h'
+
+    def stitch_when_done(chapter, failed):
+        if not failed:
+            stitch_chapter(ctx, chapter, quality, ladder)
+
+    journal = BuildJournal(quality, prod, resume=resume)
+    scenes = [(chapter, scene) for chapter in chapter_dirs() for scene in scene_names(chapter)]
+    if resume:
+        scenes = journal.unfinished(scenes)
+        if scenes:
+            print(f"Resuming from {scenes[0][0]}/{scenes[0][1]} ({len(scenes)} scene(s) unfinished)")
+    if not force:
+        scenes = stale_scenes(scenes, quality, prod)
+    for chapter, scene in scenes:
+        journal.mark(chapter, scene, "pending")
+    if scenes:
+        warm_tex_cache()
 
-    # Set environment variables
-    env_vars = [
-        f"CHAPTER_NUM={chapter_num}",
-        f"SCENE_NUM={scene_num}",
+    # Chapters with nothing to render are stitched straight away
+    pending_chapters = {chapter for chapter, _ in scenes}
+    for chapter in chapter_dirs():
+        if chapter not in pending_chapters:
+            stitch_chapter(ctx, chapter, quality, ladder)
+
+    report_failures(build_scenes(
+        ctx, scenes, quality, prod, jobs, pause_time, stitch_when_done, journal, retries, backoff,
+    ))
+
+@task
+def affected(ctx, since='HEAD', quality='l', prod=False, build=False, jobs=1):
+    """List scenes whose inputs changed since a git revision. Use --build to rebuild and restitch exactly those scenes."""
+    read_since = git_reader(since)
+    scenes = [
+        (chapter, scene)
+        for chapter in chapter_dirs() for scene in scene_names(chapter)
+        if scene_inputs_digest(chapter, scene, quality, prod)
+        != scene_inputs_digest(chapter, scene, quality, prod, read_since)
     ]
-    if prod:
-        env_vars.append("PROD_MODE=1")
-        env_vars.append("VOICE_SERVICE=elevenlabs")
+
+    if not scenes:
+        print(f"No scenes affected since {since}")
+        return
+    print(f"{len(scenes)} scene(s) affected since {since}:")
+    for chapter, scene in scenes:
+        print(f"  {chapter}/{scene}")
+    if not build:
+        return
+
+    def stitch_when_done(chapter, failed):
+        if not failed:
+            stitch_chapter(ctx, chapter, quality)
+
+    report_failures(build_scenes(ctx, scenes, quality, prod, jobs, on_chapter_done=stitch_when_done))
+
+@task
+def prefetch(ctx, chapter='', prod=False, jobs=4, retries=3, backoff=5):
+    """Synthesise every scene's narration into the TTS cache without rendering. Use --chapter to limit it to one chapter. Use --jobs N to bound the number of requests in flight."""
+    chapters = [chapter] if chapter else chapter_dirs()
+    scenes = [(chapter, scene) for chapter in chapters for scene in scene_names(chapter)]
+    if prefetch_scenes(scenes, prod, jobs, retries, backoff):
+        raise Exit(code=1)
+
+@task
+def warm_tex(ctx, jobs=0):
+    """Compile every distinct MathTex/Tex expression into the shared Tex cache in parallel. Use --jobs N to set the number of processes (default: one per CPU)."""
+    if warm_tex_cache(jobs or None):
+        raise Exit(code=1)
+
+@task
+def plan(ctx, chapter='', prod=False, calibrate=False, max_minutes=5.0):
+    """Estimate each scene's and chapter's narration runtime from source, without synthesising anything. Use --calibrate to refit the estimate on the audio in the TTS cache. Scenes longer than --max-minutes are flagged."""
+    # Imported here so tasks that never synthesise speech do not load manim
+    from scene_utils import calibrate_narration_model, estimate_narration, load_narration_model
+
+    voice_service = scene_env("", "", prod)["VOICE_SERVICE"]
+    if calibrate and voice_service != "offline":
+        model = calibrate_narration_model(voice_service)
+        if not model.is_calibrated:
+            print(f"Not enough cached {voice_service} audio to calibrate, using the default rate")
     else:
-        env_vars.append("VOICE_SERVICE=gtts")
+        model = load_narration_model(voice_service)
+    if model.is_calibrated:
+        print(f"{voice_service} model fitted on {model.samples} clips, "
+              f"mean error {model.mean_error:.2f}s per voiceover")
 
-    env_prefix = " ".join(env_vars)
-    command = f"{env_prefix} manim -q{quality} {scene}.py"
-    with ctx.cd(chapter):
-        ctx.run(command)
+    def minutes(seconds):
+        return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+
+    chapters = [chapter] if chapter else chapter_dirs()
+    total = 0.0
+    long_scenes = []
+    for chapter in chapters:
+        print(f"\n{chapter}")
+        chapter_total = 0.0
+        for scene in scene_names(chapter):
+            texts, dynamic = voiceover_texts(os.path.join(chapter, f"{scene}.py"))
+            seconds = estimate_narration(texts, model)
+            chapter_total += seconds
+            flag = ""
+            if seconds > max_minutes * 60:
+                flag = "  (over budget)"
+                long_scenes.append((chapter, scene, seconds))
+            extra = f", {len(dynamic)} not estimable" if dynamic else ""
+            print(f"  {scene:<8} {minutes(seconds):>8}  {len(texts)} voiceover(s){extra}{flag}")
+        print(f"  {'total':<8} {minutes(chapter_total):>8}")
+        total += chapter_total
+
+    print(f"\nEstimated narration: {minutes(total)} across {len(chapters)} chapter(s)")
+    if long_scenes:
+        print(f"{len(long_scenes)} scene(s) over {max_minutes:g} minutes:")
+        for chapter, scene, seconds in long_scenes:
+            print(f"  {chapter}/{scene} {minutes(seconds)}")
 
 @task
-def build_chapter(ctx, chapter, quality='l', pause_time=3, prod=False, stitch=True):
-    """Build all scenes in a chapter and stitch the final video. Use --prod for production build with ElevenLabs TTS. Use --no-stitch to skip stitching."""
-    for filename in sorted(os.listdir(chapter)):
-        if filename.startswith("Scene") and filename.endswith(".py"):
-            scene = filename.replace(".py", "")
-            build_scene(ctx, chapter, scene, quality, prod)
-            sleep(pause_time)
-    if stitch:
-        stitch_chapter(ctx, chapter, quality)
+def farm(ctx, quality='l', prod=False, workers=0, force=False, retries=2, backoff=30, stale_after=300, poll=2,
+         queue=FARM_DIR, ladder=False):
+    """Build all chapters on a render farm. Stale scenes are put on a file queue that `invoke farm-worker` processes pull from; each chapter is stitched as soon as its scenes are in. Use --workers N to start N local workers. Use --queue to point at a directory shared with other hosts."""
+    if ladder:
+        quality = 'h'
+    jobs_queue = JobQueue(queue)
+    jobs_queue.clear()
+
+    scenes = [(chapter, scene) for chapter in chapter_dirs() for scene in scene_names(chapter)]
+    if not force:
+        scenes = stale_scenes(scenes, quality, prod)
+    digests = {
+        (chapter, scene): scene_inputs_digest(chapter, scene, quality, prod)
+        for chapter, scene in scenes
+    }
+    if scenes:
+        prefetch_scenes(scenes, prod)
+        warm_tex_cache()
+
+    remaining = {}
+    for chapter, scene in scenes:
+        remaining[chapter] = remaining.get(chapter, 0) + 1
+        jobs_queue.submit(dict(
+            chapter=chapter, scene=scene, quality=quality, prod=prod, retries=retries, backoff=backoff,
+            digest=digests[(chapter, scene)],
+        ))
+
+    for chapter in chapter_dirs():
+        if chapter not in remaining:
+            stitch_chapter(ctx, chapter, quality, ladder)
+    if not scenes:
+        return
+    print(f"Queued {len(scenes)} scene(s) in {queue}")
+
+    local_workers = [
+        subprocess.Popen(["invoke", "farm-worker", "--queue", queue, "--exit-when-empty"])
+        for _ in range(workers)
+    ]
+
+    manifest = BuildManifest()
+    report = BuildReport(quality, prod)
+    failed_chapters = set()
+    failures = []
+    seen = set()
+    while len(seen) < len(scenes):
+        for job_id in jobs_queue.requeue_stale(stale_after):
+            print(f"No heartbeat for {job_id} in {stale_after}s, requeued")
+        for job_id, result in jobs_queue.results():
+            if job_id in seen:
+                continue
+            seen.add(job_id)
+            chapter, scene, returncode = result["chapter"], result["scene"], result["returncode"]
+            status = "ok" if returncode == 0 else f"FAILED ({returncode})"
+            print(f"[{len(seen)}/{len(scenes)}] {chapter}/{scene} {status} on {result['worker']} "
+                  f"in {result['stats']['wall_seconds']:.1f}s")
+            report.add_scene(chapter, scene, returncode, result["stats"])
+            if returncode == 0:
+                jobs_queue.fetch(scene_output(chapter, scene, quality))
+                record_scene(manifest, chapter, scene, quality, prod, digests[(chapter, scene)])
+            else:
+                failures.append((chapter, scene, returncode, result["log"]))
+                failed_chapters.add(chapter)
+
+            remaining[chapter] -= 1
+            if remaining[chapter] == 0 and chapter not in failed_chapters:
+                start = time.monotonic()
+                stitch_chapter(ctx, chapter, quality, ladder)
+                report.add_stitch(chapter, time.monotonic() - start)
+        if len(seen) < len(scenes):
+            sleep(poll)
+
+    for worker in local_workers:
+        worker.wait()
+    print(f"\nTiming report written to {report.write()}")
+    report_failures(failures)
 
 @task
-def build_all(ctx, quality="l", prod=False):
-    """Build all chapters. Use --prod for production build with ElevenLabs TTS."""
-    for chapter in sorted(os.listdir()):
-        if os.path.isdir(chapter) and chapter.startswith("Chapter"):
-            build_chapter(ctx, chapter, quality, prod=prod)
+def farm_worker(ctx, queue=FARM_DIR, name='', poll=2, heartbeat=10, exit_when_empty=False):
+    """Render scenes from a farm queue (see `invoke farm`). Start one per spare core or host, all pointing --queue at the same directory. Jobs whose inputs hash differently in this checkout are failed without rendering. Use --exit-when-empty to stop once no job is pending or running."""
+    jobs_queue = JobQueue(queue)
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    while True:
+        claimed = jobs_queue.claim()
+        if claimed is None:
+            if exit_when_empty and jobs_queue.is_drained():
+                return
+            sleep(poll)
+            continue
+
+        job_id, job = claimed
+        chapter, scene, quality = job["chapter"], job["scene"], job["quality"]
+
+        # A worker on another revision would publish a video the coordinator
+        # records under the wrong inputs
+        digest = scene_inputs_digest(chapter, scene, quality, job["prod"])
+        if digest != job["digest"]:
+            print(f"{name}: refusing {chapter}/{scene}, its inputs differ from the coordinator's")
+            log_path = os.path.join(chapter, "media", "logs", f"{scene}.log")
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            with open(log_path, "w") as f:
+                f.write(f"{name}: scene inputs digest {digest} does not match the job's {job['digest']}; "
+                        "check out the coordinator's revision on this worker\n")
+            jobs_queue.publish(log_path, job["run"])
+            stats = dict(cpu_seconds=0.0, max_rss_bytes=0, wall_seconds=0.0)
+            stats.update(scene_media_stats(chapter, scene, RESOLUTIONS[quality]))
+            jobs_queue.complete(job_id, dict(
+                job, worker=name, returncode=DIGEST_MISMATCH, stats=stats,
+                log=jobs_queue.media_path(log_path, job["run"]),
+            ))
+            continue
+
+        print(f"{name}: rendering {chapter}/{scene}")
+
+        # Keep the claim fresh so the coordinator does not hand it to another worker
+        stop = threading.Event()
+
+        def keep_alive():
+            while not stop.wait(heartbeat):
+                jobs_queue.heartbeat(job_id)
+
+        beat = threading.Thread(target=keep_alive, daemon=True)
+        beat.start()
+        try:
+            returncode, stats, log_path = run_scene_with_retries(
+                chapter, scene, quality, job["prod"], job["retries"], job["backoff"],
+            )
+        finally:
+            stop.set()
+            beat.join()
+
+        log_path = os.path.relpath(log_path)
+        # Published under the job's run, so a worker left over from an
+        # interrupted run cannot overwrite the current run's videos
+        jobs_queue.publish(log_path, job["run"])
+        if returncode == 0:
+            jobs_queue.publish(scene_output(chapter, scene, quality), job["run"])
+        completed = jobs_queue.complete(job_id, dict(
+            job, worker=name, returncode=returncode, stats=stats,
+            log=jobs_queue.media_path(log_path, job["run"]),
+        ))
+        if not completed:
+            print(f"{name}: {chapter}/{scene} is no longer claimed (requeued or from a cleared run), "
+                  "result discarded")
 
 @task
-def stitch_chapter(ctx, chapter, quality="l"):
-    os.chdir(chapter)
+def stitch_chapter(ctx, chapter, quality="l", ladder=False, hls=False, force=False):
+    """Stitch a chapter's scene videos into docs/. Inputs are probed first: scenes matching the common codec parameters are stream-copied, only mismatched ones are re-encoded, and each scene gets a chapter marker. A chapter already stitched from the same scene videos is skipped unless --force is given. Use --ladder to stitch the 1080p60 renders and derive the lower renditions from them. Use --hls to also package the result as HLS."""
+    if ladder:
+        quality = 'h'
     media_folder = os.path.join("media", "videos")
     video_files = []
-    resolution = dict(l='480p15', m='720p30', h='1080p60')[quality]
+    resolution = RESOLUTIONS[quality]
 
-    search_pattern = os.path.join(media_folder, f"Scene*/{resolution}/Scene*.mp4")
+    search_pattern = os.path.join(chapter, media_folder, f"Scene*/{resolution}/Scene*.mp4")
     for video in glob.glob(search_pattern):
         if video.endswith(".mp4"):
-            video_files.append(video)
+            video_files.append(os.path.relpath(video, chapter))
 
     # Sort videos based on scene order (Scene0, Scene1, etc.)
     video_files.sort(key=lambda x: int(x.split("Scene")[-1].split(".")[0]))
@@ -67,21 +688,113 @@ def stitch_chapter(ctx, chapter, quality="l"):
         print(f"No videos found for resolution '{resolution}' in {media_folder}")
         return
 
-    # Create temporary file list for ffmpeg
-    with open(f"videos_to_stitch.txt", "w") as f:
-        for video in video_files:
+    # The outputs are current if they were stitched from exactly these videos
+    outputs = [os.path.join("docs", f"{chapter}_{resolution}.mp4")]
+    if ladder:
+        outputs += [path for path, *_ in lower_renditions(chapter, quality)]
+    stitched = StitchManifest()
+    digest = StitchManifest.inputs_digest([os.path.join(chapter, video) for video in video_files])
+    if not force and stitched.is_current(chapter, quality, ladder, digest, outputs):
+        print(f"{chapter} is already stitched from these scene videos, skipping")
+        if hls:
+            package_hls(ctx, chapter)
+        return
+
+    # Probe every input and find the parameters most scenes share
+    infos = {video: probe(os.path.join(chapter, video)) for video in video_files}
+    signatures = {video: stream_signature(info) for video, info in infos.items()}
+    reference = reference_signature(list(signatures.values()))
+
+    # Re-encode only the scenes that would break a stream copy
+    inputs = []
+    for video in video_files:
+        if signatures[video] == reference:
+            inputs.append((video, infos[video]))
+            continue
+        conformed = os.path.join("media", "stitch", resolution, os.path.basename(video))
+        print(f"{chapter}/{os.path.basename(video)}: {describe_signature(signatures[video])} "
+              f"does not match {describe_signature(reference)}, re-encoding")
+        os.makedirs(os.path.dirname(os.path.join(chapter, conformed)), exist_ok=True)
+        ctx.run(shlex.join(conform_command(
+            os.path.join(chapter, video), os.path.join(chapter, conformed), reference,
+        )))
+        inputs.append((conformed, probe(os.path.join(chapter, conformed))))
+
+    # Create temporary file list and chapter markers for ffmpeg
+    list_file = os.path.join(chapter, "videos_to_stitch.txt")
+    with open(list_file, "w") as f:
+        for video, _ in inputs:
             f.write(f"file '{video}'\n")
 
+    markers_file = os.path.join(chapter, "chapter_markers.txt")
+    with open(markers_file, "w") as f:
+        f.write(chapter_metadata([
+            (os.path.basename(video).replace(".mp4", ""), float(info["format"]["duration"]))
+            for video, info in inputs
+        ]))
+
     # Stitch videos using ffmpeg
-    ctx.run(f"ffmpeg -y -f concat -safe 0 -i videos_to_stitch.txt -c copy ../docs/{chapter}_{resolution}.mp4")
-    os.unlink('videos_to_stitch.txt')
-    os.chdir('..')
+    with ctx.cd(chapter):
+        ctx.run(
+            "ffmpeg -y -f concat -safe 0 -i videos_to_stitch.txt -i chapter_markers.txt "
+            f"-map 0 -map_metadata 1 -map_chapters 1 -c copy ../docs/{chapter}_{resolution}.mp4"
+        )
+    os.unlink(list_file)
+    os.unlink(markers_file)
+
+    if ladder:
+        derive_renditions(ctx, chapter, quality)
+    stitched.record(chapter, quality, ladder, digest, outputs)
+    if hls:
+        package_hls(ctx, chapter)
+
+def lower_renditions(chapter, quality):
+    """(path, width, height, fps) of every chapter video below `quality`."""
+    top_height = FRAME_SIZES[quality][1]
+    return [
+        (os.path.join("docs", f"{chapter}_{RESOLUTIONS[q]}.mp4"), *FRAME_SIZES[q])
+        for q in RESOLUTIONS if FRAME_SIZES[q][1] < top_height
+    ]
 
 @task
-def stitch_all(ctx, quality="l"):
-    for chapter in sorted(os.listdir()):
-        if os.path.isdir(chapter) and chapter.startswith("Chapter"):
-            stitch_chapter(ctx, chapter, quality)
+def derive_renditions(ctx, chapter, quality="h"):
+    """Derive every lower-resolution chapter video from the stitched one in a single multi-output ffmpeg pass."""
+    source = os.path.join("docs", f"{chapter}_{RESOLUTIONS[quality]}.mp4")
+    renditions = lower_renditions(chapter, quality)
+    if not renditions:
+        print(f"No renditions below {RESOLUTIONS[quality]} to derive")
+        return
+    ctx.run(shlex.join(ladder_command(source, renditions)))
+
+@task
+def package_hls(ctx, chapter, segment_time=6):
+    """Package every stitched rendition of a chapter as segmented HLS, cut at scene boundaries, under a master playlist."""
+    hls_dir = os.path.join("docs", "hls", chapter)
+    variants = []
+    for quality in sorted(RESOLUTIONS, key=lambda q: -FRAME_SIZES[q][1]):
+        resolution = RESOLUTIONS[quality]
+        source = os.path.join("docs", f"{chapter}_{resolution}.mp4")
+        if not os.path.exists(source):
+            continue
+
+        out_dir = os.path.join(hls_dir, resolution)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.makedirs(out_dir)
+        info = probe(source)
+        ctx.run(shlex.join(hls_command(source, out_dir, segment_times(info, segment_time))))
+        variants.append((f"{resolution}/index.m3u8", int(info["format"]["bit_rate"]), *FRAME_SIZES[quality]))
+
+    if not variants:
+        print(f"No stitched videos found for {chapter} in docs/")
+        return
+    with open(os.path.join(hls_dir, "master.m3u8"), "w") as f:
+        f.write(master_playlist(variants))
+    print(f"Wrote {os.path.join(hls_dir, 'master.m3u8')} with {len(variants)} rendition(s)")
+
+@task
+def stitch_all(ctx, quality="l", ladder=False, hls=False, force=False):
+    for chapter in chapter_dirs():
+        stitch_chapter(ctx, chapter, quality, ladder, hls, force)
 
 @task
 def clean_chapter(ctx, chapter):
@@ -101,26 +814,78 @@ def clean_chapter(ctx, chapter):
 
 @task
 def clean_all(ctx):
-    for chapter in sorted(os.listdir()):
-        if os.path.isdir(chapter) and chapter.startswith("Chapter"):
-            clean_chapter(ctx, chapter)
-
-@task
-def render_thumbnails(ctx, quality='l'):
-    # Look for chapter directories like "Chapter0", "Chapter1", etc.
-    for chapter in sorted(os.listdir()):
-        if os.path.isdir(chapter) and chapter.startswith("Chapter"):
-            scene_file = os.path.join("Thumb.py")
-            output_image = os.path.join(f"../../../../docs/{chapter}.png")
-            command = f"manim -q{quality} -s {scene_file} Thumb -o {output_image}"
-            with ctx.cd(chapter):
-                ctx.run(command)
-
-@task
-def all(ctx, quality='l', prod=False):
-    """Full rebuild: clean, build, stitch, thumbnails. Use --prod for production."""
-    build_all(ctx, quality, prod=prod)
-    stitch_all(ctx, quality)
+    for chapter in chapter_dirs():
+        clean_chapter(ctx, chapter)
+
+def run_thumbnail(chapter, quality='l'):
+    """
+    Render a chapter's Thumb.py to docs/ChapterN.png, logging to media/logs/Thumb.log.
+
+    Returns:
+        Tuple of (returncode, log path)
+    """
+    chapter_dir = os.path.abspath(chapter)
+    log_dir = os.path.join(chapter_dir, "media", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, "Thumb.log")
+
+    output_image = os.path.join(f"../../../../docs/{chapter}.png")
+    command = f"GLOBAL_TEX_CACHE=1 manim -q{quality} -s Thumb.py Thumb -o {output_image}"
+    with open(log_path, "w") as log:
+        result = subprocess.run(command, shell=True, cwd=chapter_dir, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, log_path
+
+
+@task
+def render_thumbnails(ctx, quality='l', jobs=4, force=False, webp=False, sizes=''):
+    """Render chapter thumbnails in parallel, skipping any whose Thumb.py inputs are unchanged. Use --webp and --sizes 480,240 to also write WebP and downscaled variants."""
+    manifest = BuildManifest()
+    widths = [int(w) for w in sizes.split(",") if w.strip()]
+
+    # Thumbnails are tracked in the build manifest like scenes
+    pending = {}
+    for chapter in chapter_dirs():
+        if not os.path.exists(os.path.join(chapter, "Thumb.py")):
+            continue
+        digest = scene_digest(chapter, "Thumb", {"quality": quality})
+        if not force and manifest.is_current(chapter, "Thumb", quality, digest, f"docs/{chapter}.png"):
+            print(f"{chapter} thumbnail is up to date, skipping")
+        else:
+            pending[chapter] = digest
+
+    failures = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(run_thumbnail, chapter, quality): chapter for chapter in pending}
+        for future in as_completed(futures):
+            chapter = futures[future]
+            returncode, log_path = future.result()
+            print(f"{chapter} thumbnail {'ok' if returncode == 0 else f'FAILED ({returncode})'}")
+            if returncode == 0:
+                manifest.record(chapter, "Thumb", quality, pending[chapter], f"docs/{chapter}.png")
+            else:
+                failures.append((chapter, "Thumb", returncode, log_path))
+
+    # Derive the web variants from every thumbnail, in one ffmpeg pass each
+    if webp or widths:
+        for chapter in chapter_dirs():
+            source = os.path.join("docs", f"{chapter}.png")
+            if not os.path.exists(source):
+                continue
+            outputs = [(os.path.join("docs", f"{chapter}.webp"), None)] if webp else []
+            for width in widths:
+                outputs.append((os.path.join("docs", f"{chapter}_{width}.png"), width))
+                if webp:
+                    outputs.append((os.path.join("docs", f"{chapter}_{width}.webp"), width))
+            ctx.run(shlex.join(image_variants_command(source, outputs)))
+
+    report_failures(failures)
+
+@task
+def all(ctx, quality='l', prod=False, jobs=1, force=False, resume=False, retries=2, backoff=30, ladder=False):
+    """Full rebuild: clean, build, stitch, thumbnails. Use --prod for production. Use --jobs N for parallel scene rendering. Use --force to ignore the build manifest. Use --resume to continue an interrupted run. Use --ladder to publish 1080p60, 720p30 and 480p15 from one render."""
+    build_all(ctx, quality, prod=prod, jobs=jobs, force=force, resume=resume, retries=retries, backoff=backoff,
+              ladder=ladder)
+    # build_all has already stitched every chapter
     render_thumbnails(ctx, quality)
 
 @task